@@ -12,6 +12,7 @@ FreeRTOSConfig.h 配置文件验证工具
 使用方法：
     python freertos_config_check.py FreeRTOSConfig.h
     python freertos_config_check.py FreeRTOSConfig.h --json
+    python freertos_config_check.py FreeRTOSConfig.h --json --pretty
     cat FreeRTOSConfig.h | python freertos_config_check.py --stdin
 
 作者：STM32 + FreeRTOS Agent Skill
@@ -21,10 +22,32 @@ import re
 import sys
 import json
 import argparse
-from typing import Dict, List, Optional, Tuple, Any, Sequence
-from dataclasses import dataclass, asdict
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Any, Sequence, Union
+from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import orjson  # 可选依赖：C 实现的 JSON 序列化，速度更快
+except ImportError:
+    orjson = None
+
+
+# 匹配单行 #define 宏定义（模块级预编译，避免每次解析重复查找正则缓存）
+# 仅使用 [ \t] 匹配空白，值组一次扫描到行尾，不产生回溯；行尾注释由 str.find 剥离
+_DEFINE_RE = re.compile(r'[ \t]*#[ \t]*define[ \t]+(\w+)(?:[ \t]+([^\n]*))?')
+# 二进制版本：直接扫描原始字节，仅对命中的宏名/值解码
+_DEFINE_RE_B = re.compile(_DEFINE_RE.pattern.encode("ascii"))
+
+
+def _dump_json(obj: Any, pretty: bool = False) -> str:
+    """序列化为 JSON（默认紧凑格式，便于 CI 解析；pretty 时缩进输出）"""
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
 
 class CheckStatus(Enum):
     """检查结果状态"""
@@ -44,6 +67,17 @@ class ConfigCheck:
     message: str        # 说明信息
 
 
+def _check_to_dict(c: ConfigCheck) -> Dict[str, Any]:
+    """转换为字典（字段均为基本类型，无需 asdict 的递归深拷贝）"""
+    return {
+        "name": c.name,
+        "expected": c.expected,
+        "actual": c.actual,
+        "status": c.status,
+        "message": c.message,
+    }
+
+
 @dataclass
 class CheckResult:
     """整体检查结果"""
@@ -52,6 +86,11 @@ class CheckResult:
     summary: Dict[str, int]
 
 
+def _result_to_dict(result: CheckResult) -> Dict[str, Any]:
+    """转换为可序列化字典（checks 已是字典列表，无需 asdict 的类型内省）"""
+    return {"file": result.file, "checks": result.checks, "summary": result.summary}
+
+
 class FreeRTOSConfigChecker:
     """FreeRTOSConfig.h 配置文件检查器"""
 
@@ -99,35 +138,55 @@ class FreeRTOSConfigChecker:
         ("configUSE_16_BIT_TICKS", "0", "禁用 16 位 tick（必须为 0）"),
     ]
 
+    # 合并后的检查表 (宏名, 期望值, 说明, 类别)，单次遍历完成全部检查
+    ALL_CHECKS: List[Tuple[str, Optional[str], str, str]] = (
+        [(n, e, d, "必需") for n, e, d in REQUIRED_CHECKS]
+        + [(n, e, d, "推荐") for n, e, d in RECOMMENDED_CHECKS]
+        + [(n, e, d, "可选") for n, e, d in OPTIONAL_CHECKS]
+        + [(n, e, d, "禁用") for n, e, d in DISABLED_CHECKS]
+    )
+
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
         self.checks: List[ConfigCheck] = []
+        self._status_counts: Counter = Counter()
 
-    def parse_config_file(self, content: str) -> Dict[str, str]:
+    def parse_config_file(self, content: Union[str, bytes]) -> Dict[str, str]:
         """
         解析 FreeRTOSConfig.h 文件内容
 
         Args:
-            content: 文件内容字符串
+            content: 文件内容（字符串或原始字节）
 
         Returns:
             宏定义字典 {宏名: 值}
         """
         defines = {}
 
-        # 匹配 #define 宏定义
-        pattern = r'^\s*#\s*define\s+(\w+)(?:\s+([^\/\n]+))?'
-        for match in re.finditer(pattern, content, re.MULTILINE):
+        is_bytes = isinstance(content, bytes)
+        define_re = _DEFINE_RE_B if is_bytes else _DEFINE_RE
+        needle = b'define' if is_bytes else 'define'
+
+        for line in content.splitlines():
+            # 子串预过滤：绝大多数注释/空行无需进入正则
+            if needle not in line:
+                continue
+            match = define_re.match(line)
+            if not match:
+                continue
             name = match.group(1)
             value = match.group(2)
+            if is_bytes:
+                name = name.decode("ascii")
+                value = value.decode("utf-8", errors="replace") if value else value
             if value:
+                # 移除行尾注释（// 与 /* */），以 len(value) 作为无注释时的哨兵
+                comment_idx = min(
+                    (i for i in (value.find('//'), value.find('/*')) if i >= 0),
+                    default=len(value),
+                )
                 # 清理值
-                value = value.strip()
-                # 移除行尾注释
-                comment_idx = value.find('//')
-                if comment_idx >= 0:
-                    value = value[:comment_idx].strip()
-                defines[name] = value
+                defines[name] = value[:comment_idx].strip()
 
         return defines
 
@@ -156,21 +215,9 @@ class FreeRTOSConfigChecker:
         if actual == expected:
             return CheckStatus.PASS, f"{name} = {actual}"
 
-        # 数值匹配（处理进制前缀）
+        # 数值匹配（int(x, 0) 自动识别 0x/0o/0b 进制前缀）
         try:
-            if actual.startswith(('0x', '0X')):
-                actual_int = int(actual, 16)
-            elif actual.startswith('0') and len(actual) > 1:
-                actual_int = int(actual, 8)
-            else:
-                actual_int = int(actual)
-
-            if expected.startswith(('0x', '0X')):
-                expected_int = int(expected, 16)
-            else:
-                expected_int = int(expected)
-
-            if actual_int == expected_int:
+            if int(actual, 0) == int(expected, 0):
                 return CheckStatus.PASS, f"{name} = {actual}"
         except ValueError:
             pass
@@ -182,17 +229,15 @@ class FreeRTOSConfigChecker:
             return CheckStatus.WARNING, f"{name} 推荐值为 {expected}，实际为 {actual}"
 
     def run_checks(self, defines: Dict[str, str],
-                   check_list: Sequence[Tuple[str, Optional[str], str]],
-                   category: str) -> None:
+                   check_list: Sequence[Tuple[str, Optional[str], str, str]]) -> None:
         """
         运行一组检查
 
         Args:
             defines: 宏定义字典
-            check_list: 检查项列表
-            category: 检查类别（用于输出）
+            check_list: 检查项列表，每项附带检查类别（用于输出）
         """
-        for name, expected, description in check_list:
+        for name, expected, description, category in check_list:
             actual = defines.get(name)
 
             status, message = self.check_value(name, expected, actual)
@@ -207,100 +252,111 @@ class FreeRTOSConfigChecker:
                 status=status.value,
                 message=message
             ))
+            self._status_counts[status.value] += 1
 
             if self.verbose and status != CheckStatus.PASS:
                 print(f"[{category}] {name}: {message}")
 
-    def check_config(self, content: str, filename: str = "FreeRTOSConfig.h") -> CheckResult:
+    def check_config(self, content: Union[str, bytes],
+                     filename: str = "FreeRTOSConfig.h",
+                     fail_fast: bool = False) -> CheckResult:
         """
         执行完整的配置检查
 
         Args:
             content: 文件内容
             filename: 文件名（用于输出）
+            fail_fast: 必需项失败时跳过其余检查
 
         Returns:
             检查结果
         """
         defines = self.parse_config_file(content)
         self.checks = []
+        self._status_counts = Counter()
 
-        # 运行所有检查
-        self.run_checks(defines, self.REQUIRED_CHECKS, "必需")
-        self.run_checks(defines, self.RECOMMENDED_CHECKS, "推荐")
-        self.run_checks(defines, self.OPTIONAL_CHECKS, "可选")
-        self.run_checks(defines, self.DISABLED_CHECKS, "禁用")
+        # 运行所有检查（必需项在表头，fail_fast 时失败即停止）
+        n_required = len(self.REQUIRED_CHECKS)
+        self.run_checks(defines, self.ALL_CHECKS[:n_required])
+        if not (fail_fast and self._status_counts["fail"]):
+            self.run_checks(defines, self.ALL_CHECKS[n_required:])
 
         # 计算摘要
+        counts = self._status_counts
         summary = {
-            "passed": sum(1 for c in self.checks if c.status == "pass"),
-            "failed": sum(1 for c in self.checks if c.status == "fail"),
-            "warnings": sum(1 for c in self.checks if c.status == "warning"),
-            "skipped": sum(1 for c in self.checks if c.status == "skip"),
+            "passed": counts["pass"],
+            "failed": counts["fail"],
+            "warnings": counts["warning"],
+            "skipped": counts["skip"],
             "total": len(self.checks)
         }
 
         # 构建结果
         result = CheckResult(
             file=filename,
-            checks=[asdict(c) for c in self.checks],
+            checks=[_check_to_dict(c) for c in self.checks],
             summary=summary
         )
 
         return result
 
     def print_result(self, result: CheckResult) -> None:
-        """打印人类可读的结果"""
-        print(f"\n{'='*60}")
-        print(f"FreeRTOSConfig.h 检查结果: {result.file}")
-        print(f"{'='*60}")
+        """打印人类可读的结果（先缓冲全部行，再一次性写出）"""
+        lines: List[str] = [
+            f"\n{'='*60}",
+            f"FreeRTOSConfig.h 检查结果: {result.file}",
+            f"{'='*60}",
+        ]
 
         # 打印摘要
         summary = result.summary
-        print(f"\n摘要: 通过={summary['passed']}, "
-              f"失败={summary['failed']}, "
-              f"警告={summary['warnings']}, "
-              f"总计={summary['total']}")
+        lines.append(f"\n摘要: 通过={summary['passed']}, "
+                     f"失败={summary['failed']}, "
+                     f"警告={summary['warnings']}, "
+                     f"总计={summary['total']}")
 
         # 打印详细信息
-        print(f"\n详细结果:")
-        print("-" * 60)
+        lines.append(f"\n详细结果:")
+        lines.append("-" * 60)
 
-        # 先打印失败的
+        # 单次遍历按状态分组
+        buckets: Dict[str, List[Dict]] = {"fail": [], "warning": [], "pass": [], "skip": []}
         for check in result.checks:
-            if check["status"] == "fail":
-                self._print_check(check, "❌")
+            buckets[check["status"]].append(check)
+        failed_checks = buckets["fail"]
+
+        # 先打印失败的
+        for check in failed_checks:
+            self._format_check(lines, check, "❌")
 
         # 再打印警告的
-        for check in result.checks:
-            if check["status"] == "warning":
-                self._print_check(check, "⚠️")
+        for check in buckets["warning"]:
+            self._format_check(lines, check, "⚠️")
 
-        # 最后打印通过的
-        passed_count = 0
-        for check in result.checks:
-            if check["status"] == "pass":
-                passed_count += 1
-                if passed_count <= 10:  # 只显示前 10 个
-                    self._print_check(check, "✅")
+        # 最后打印通过的（只显示前 10 个）
+        passed_count = len(buckets["pass"])
+        for check in buckets["pass"][:10]:
+            self._format_check(lines, check, "✅")
 
         if passed_count > 10:
-            print(f"... 还有 {passed_count - 10} 个检查通过")
+            lines.append(f"... 还有 {passed_count - 10} 个检查通过")
 
-        print("-" * 60)
+        lines.append("-" * 60)
 
         # 打印建议
-        failed_checks = [c for c in result.checks if c["status"] == "fail"]
         if failed_checks:
-            print(f"\n建议修复项:")
+            lines.append(f"\n建议修复项:")
             for check in failed_checks:
-                print(f"  - {check['name']}: {check['message']}")
+                lines.append(f"  - {check['name']}: {check['message']}")
+
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
 
-    def _print_check(self, check: Dict, icon: str) -> None:
-        """打印单个检查结果"""
-        print(f"{icon} {check['name']}")
-        print(f"   期望: {check['expected']}, 实际: {check['actual']}")
-        print(f"   说明: {check['message']}")
+    def _format_check(self, lines: List[str], check: Dict, icon: str) -> None:
+        """格式化单个检查结果并追加到输出缓冲"""
+        lines.append(f"{icon} {check['name']}")
+        lines.append(f"   期望: {check['expected']}, 实际: {check['actual']}")
+        lines.append(f"   说明: {check['message']}")
 
 
 def main():
@@ -312,7 +368,9 @@ def main():
 示例:
   %(prog)s FreeRTOSConfig.h
   %(prog)s FreeRTOSConfig.h --json
+  %(prog)s FreeRTOSConfig.h --json --pretty
   %(prog)s FreeRTOSConfig.h --verbose
+  %(prog)s FreeRTOSConfig.h --fail-fast
   cat FreeRTOSConfig.h | %(prog)s --stdin
         """
     )
@@ -320,23 +378,27 @@ def main():
     parser.add_argument("filename", nargs="?", help="配置文件路径")
     parser.add_argument("--json", action="store_true",
                         help="输出 JSON 格式")
+    parser.add_argument("--pretty", action="store_true",
+                        help="JSON 缩进输出（默认紧凑格式）")
     parser.add_argument("--stdin", action="store_true",
                         help="从标准输入读取")
     parser.add_argument("--verbose", "-v", action="store_true",
                         help="详细输出")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="必需项检查失败时跳过其余检查")
     parser.add_argument("--output", "-o", help="输出到文件")
 
     args = parser.parse_args()
 
     # 读取配置文件
-    content = ""
+    content = b""
 
     if args.stdin:
-        content = sys.stdin.read()
+        content = sys.stdin.buffer.read()
         filename = "<stdin>"
     elif args.filename:
         try:
-            with open(args.filename, "r", encoding="utf-8") as f:
+            with open(args.filename, "rb") as f:
                 content = f.read()
             filename = args.filename
         except FileNotFoundError:
@@ -356,12 +418,12 @@ def main():
 
     # 运行检查
     checker = FreeRTOSConfigChecker(verbose=args.verbose)
-    result = checker.check_config(content, filename)
+    result = checker.check_config(content, filename, fail_fast=args.fail_fast)
 
     # 输出结果
     if args.json:
         # JSON 格式输出
-        output = json.dumps(asdict(result), indent=2, ensure_ascii=False)
+        output = _dump_json(_result_to_dict(result), args.pretty)
         if args.output:
             with open(args.output, "w", encoding="utf-8") as f:
                 f.write(output)
@@ -373,7 +435,7 @@ def main():
 
         # 如果指定输出文件
         if args.output:
-            output = json.dumps(asdict(result), indent=2, ensure_ascii=False)
+            output = _dump_json(_result_to_dict(result), args.pretty)
             with open(args.output, "w", encoding="utf-8") as f:
                 f.write(output)
             print(f"\n结果已保存到: {args.output}")
@@ -1,15 +1,67 @@
+import argparse
 import sys
 import os
-import time
 
 # Add tools/hil to path
 sys.path.append(os.path.join(os.getcwd(), "tools", "hil"))
 
 from language_tester import LanguageTester
 
-
-def debug_il_test():
-    print("DEBUG: Iniciando test simple de IL...")
+# Escenarios predefinidos: (archivo IL, duracion, [(offset %Q, valor, descripcion)])
+PRESETS = {
+    "arithmetic": (
+        "tools/hil/il_tests/arithmetic.il",
+        0.5,
+        [(0, 10, "a"), (4, 15, "res_add")],
+    ),
+    "minimal": (
+        "tools/hil/il_tests/minimal.il",
+        1.0,
+        [(0, 123, "res")],
+    ),
+}
+
+
+def parse_expect(spec):
+    """Parsea OFFSET=VALOR (enteros, admite prefijo 0x) para un INT en %Q."""
+    offset, _, value = spec.partition("=")
+    if not value:
+        raise argparse.ArgumentTypeError(f"formato invalido '{spec}', usar OFFSET=VALOR")
+    offset = int(offset, 0)
+    return offset, int(value, 0), f"%Q{offset}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Depuracion HIL de un programa IL")
+    parser.add_argument(
+        "preset",
+        nargs="?",
+        choices=sorted(PRESETS),
+        default="arithmetic",
+        help="Escenario predefinido (por defecto: arithmetic)",
+    )
+    parser.add_argument("--il-file", help="Archivo IL a compilar (sobrescribe el preset)")
+    parser.add_argument("--duration", type=float, help="Segundos de ejecucion")
+    parser.add_argument(
+        "--expect",
+        type=parse_expect,
+        action="append",
+        metavar="OFFSET=VALOR",
+        help="INT esperado en %%Q (repetible, sobrescribe el preset)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(args):
+    il_file, duration, expects = PRESETS[args.preset]
+    if args.il_file:
+        il_file = args.il_file
+    if args.duration is not None:
+        duration = args.duration
+    if args.expect:
+        expects = args.expect
+
+    print(f"DEBUG: Iniciando test de IL ({il_file})...")
 
     try:
         tester = LanguageTester()
@@ -20,7 +72,6 @@ def debug_il_test():
         tester.reset_state()
         print("DEBUG: Dispositivo reseteado.")
 
-        il_file = "tools/hil/il_tests/arithmetic.il"
         print(f"DEBUG: Compilando y corriendo {il_file}...")
 
         # Run manually to see steps
@@ -30,24 +81,30 @@ def debug_il_test():
         tester.upload_bytecode(bytecode)
         print("DEBUG: Bytecode subido.")
 
-        print("DEBUG: Iniciando ejecucion (0.5s)...")
-        tester.start_and_wait(duration=0.5)
+        print(f"DEBUG: Iniciando ejecucion ({duration}s)...")
+        tester.start_and_wait(duration=duration)
         print("DEBUG: Ejecucion finalizada.")
 
         # Check values
         print("DEBUG: Verificando memoria...")
-        val_a = tester.expect_int16(0, 10, "a")
-        val_res = tester.expect_int16(4, 15, "res_add")
+        ok = all(
+            [
+                tester.expect_int16(offset, value, desc)
+                for offset, value, desc in expects
+            ]
+        )
 
         tester.close()
-        print("DEBUG: Test finalizado.")
+        print("DEBUG: Test finalizado." if ok else "FAIL: Valores incorrectos")
+        return ok
 
     except Exception as e:
         print(f"ERROR FATAL: {e}")
         import traceback
 
         traceback.print_exc()
+        return False
 
 
 if __name__ == "__main__":
-    debug_il_test()
+    sys.exit(0 if main(parse_args()) else 1)
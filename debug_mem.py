@@ -1,6 +1,5 @@
 import sys
 import os
-import time
 import serial
 
 
@@ -14,20 +13,18 @@ def debug_memory():
         # Reset input buffer
         ser.reset_input_buffer()
         ser.write(b"\r\n")
-        time.sleep(0.5)
+        ser.read_until(b"zplc:~$")
 
         # Test Poke
         print("DEBUG: Pokeando 0x12 en direccion 0 (IPI)...")
         ser.write(b"zplc dbg poke 0 18\r\n")  # 18 = 0x12
-        time.sleep(0.5)
-        resp = ser.read_all().decode("utf-8", errors="ignore")
+        resp = ser.read_until(b"zplc:~$").decode("utf-8", errors="ignore")
         print(f"DEBUG: Poke resp: [{resp.strip()}]")
 
         # Test Peek
         print("DEBUG: Leyendo direccion 0...")
         ser.write(b"zplc dbg peek 0 1\r\n")
-        time.sleep(0.5)
-        resp = ser.read_all().decode("utf-8", errors="ignore")
+        resp = ser.read_until(b"zplc:~$").decode("utf-8", errors="ignore")
         print(f"DEBUG: Peek resp:\n{resp}")
 
         if "12" in resp:
@@ -96,6 +96,8 @@ static struct {
 #ifdef CONFIG_ZPLC_HIL_DEBUG
 #define HIL_MAX_WATCHES 8
 #define HIL_WATCH_POLL_MS 100
+#define HIL_WATCH_POLL_MIN_MS 5
+#define HIL_WATCH_POLL_MAX_MS 1000
 
 typedef enum {
   HIL_WATCH_BOOL = 0,
@@ -127,6 +129,7 @@ typedef struct {
 
 static hil_watch_entry_t s_hil_watches[HIL_MAX_WATCHES];
 static const struct shell *s_hil_shell;
+static uint32_t s_hil_watch_poll_ms = HIL_WATCH_POLL_MS;
 
 static void hil_watch_work_handler(struct k_work *work);
 static K_WORK_DELAYABLE_DEFINE(s_hil_watch_work, hil_watch_work_handler);
@@ -213,6 +216,8 @@ static const char *hil_mode_name(hil_mode_t mode) {
     return "summary";
   case HIL_MODE_VERBOSE:
     return "verbose";
+  case HIL_MODE_COMPACT:
+    return "compact";
   case HIL_MODE_OFF:
   default:
     return "off";
@@ -456,7 +461,7 @@ static void hil_watch_work_handler(struct k_work *work) {
   }
 
   hil_watch_poll_once(false);
-  (void)k_work_reschedule(&s_hil_watch_work, K_MSEC(HIL_WATCH_POLL_MS));
+  (void)k_work_reschedule(&s_hil_watch_work, K_MSEC(s_hil_watch_poll_ms));
 }
 
 static void hil_watch_arm_poll(void) {
@@ -465,7 +470,7 @@ static void hil_watch_arm_poll(void) {
     return;
   }
 
-  (void)k_work_reschedule(&s_hil_watch_work, K_MSEC(HIL_WATCH_POLL_MS));
+  (void)k_work_reschedule(&s_hil_watch_work, K_MSEC(s_hil_watch_poll_ms));
 }
 #endif
 
@@ -526,6 +531,7 @@ static int cmd_dbg_resume(const struct shell *sh, size_t argc, char **argv);
 static int cmd_dbg_step(const struct shell *sh, size_t argc, char **argv);
 static int cmd_dbg_peek(const struct shell *sh, size_t argc, char **argv);
 static int cmd_dbg_poke(const struct shell *sh, size_t argc, char **argv);
+static int cmd_dbg_pokehex(const struct shell *sh, size_t argc, char **argv);
 static int cmd_dbg_info(const struct shell *sh, size_t argc, char **argv);
 static int cmd_dbg_ticks(const struct shell *sh, size_t argc, char **argv);
 static int cmd_dbg_mem(const struct shell *sh, size_t argc, char **argv);
@@ -551,6 +557,7 @@ static int cmd_adc_read(const struct shell *sh, size_t argc, char **argv);
 /* HIL Debug Handlers */
 #ifdef CONFIG_ZPLC_HIL_DEBUG
 static int cmd_hil_mode(const struct shell *sh, size_t argc, char **argv);
+static int cmd_hil_filter(const struct shell *sh, size_t argc, char **argv);
 static int cmd_hil_status(const struct shell *sh, size_t argc, char **argv);
 static int cmd_hil_watch(const struct shell *sh, size_t argc, char **argv);
 static int cmd_hil_reset(const struct shell *sh, size_t argc, char **argv);
@@ -1147,6 +1154,66 @@ static int cmd_dbg_poke(const struct shell *sh, size_t argc, char **argv) {
   return 0;
 }
 
+/**
+ * @brief Handler for 'zplc dbg pokehex <addr> <hexbytes>'
+ *
+ * Writes a run of consecutive bytes in one command, so initializing a buffer
+ * costs one serial round-trip instead of one 'poke' per byte.
+ *
+ * Example:
+ *   zplc dbg pokehex 0x2100 05000a0048656c6c6f00
+ *
+ * Constraints:
+ *   - 1 to SHELL_FORCE_MAX_BYTES bytes per call
+ *   - The whole range must be in a valid ZPLC memory region
+ */
+static int cmd_dbg_pokehex(const struct shell *sh, size_t argc, char **argv) {
+  char *endptr;
+  unsigned long addr;
+  int decoded;
+  int rc;
+  uint8_t bytes[SHELL_FORCE_MAX_BYTES];
+
+  if (argc != 3) {
+    shell_error(sh, "Usage: zplc dbg pokehex <addr> <hexbytes>");
+    return -EINVAL;
+  }
+
+  addr = strtoul(argv[1], &endptr, 0);
+  if (*endptr != '\0' || addr > UINT16_MAX) {
+    shell_error(sh, "ERROR: Invalid address");
+    return -EINVAL;
+  }
+
+  decoded = hex_decode(argv[2], bytes, sizeof(bytes));
+  if (decoded <= 0) {
+    shell_error(sh, "ERROR: Invalid hex payload");
+    return -EINVAL;
+  }
+
+#ifdef CONFIG_ZPLC_SCHEDULER
+  if (zplc_sched_lock(5) != 0) {
+    shell_error(sh, "ERROR: Could not acquire scheduler lock");
+    return -EBUSY;
+  }
+#endif
+
+  rc = zplc_force_write_bytes((uint16_t)addr, bytes, (uint16_t)decoded);
+
+#ifdef CONFIG_ZPLC_SCHEDULER
+  (void)zplc_sched_unlock();
+#endif
+
+  if (rc != 0) {
+    shell_error(sh, "ERROR: Invalid memory address");
+    return -EINVAL;
+  }
+
+  shell_print(sh, "OK: Wrote %d byte(s) to 0x%04lX", decoded, addr);
+
+  return 0;
+}
+
 static int cmd_dbg_force_set(const struct shell *sh, size_t argc, char **argv) {
   char *endptr;
   unsigned long addr;
@@ -2038,7 +2105,7 @@ static int cmd_hil_mode(const struct shell *sh, size_t argc, char **argv) {
   if (argc < 2) {
     hil_set_shell(sh);
     s_hil_shell = sh;
-    hil_send_ack("mode", "", false, "usage: hil mode <off|summary|verbose>");
+    hil_send_ack("mode", "", false, "usage: hil mode <off|summary|verbose|compact>");
     return -EINVAL;
   }
 
@@ -2048,6 +2115,8 @@ static int cmd_hil_mode(const struct shell *sh, size_t argc, char **argv) {
     mode = HIL_MODE_SUMMARY;
   } else if (strcmp(argv[1], "verbose") == 0) {
     mode = HIL_MODE_VERBOSE;
+  } else if (strcmp(argv[1], "compact") == 0) {
+    mode = HIL_MODE_COMPACT;
   } else {
     hil_set_shell(sh);
     s_hil_shell = sh;
@@ -2063,6 +2132,53 @@ static int cmd_hil_mode(const struct shell *sh, size_t argc, char **argv) {
   return 0;
 }
 
+static int cmd_hil_filter(const struct shell *sh, size_t argc, char **argv) {
+  hil_set_shell(sh);
+  s_hil_shell = sh;
+
+  if (argc < 2) {
+    hil_send_ack("filter", "", false, "usage: hil filter <all|OP[,OP...]>");
+    return -EINVAL;
+  }
+
+  if (strcmp(argv[1], "all") == 0) {
+    hil_filter_all(true);
+    hil_send_ack("filter", "all", true, NULL);
+    return 0;
+  }
+
+  /* Validate every name first so a typo leaves the filter untouched */
+  char buf[128];
+  char *saveptr = NULL;
+
+  /* Reject instead of truncating: a cut-off list would be acked as applied */
+  if (strlen(argv[1]) >= sizeof(buf)) {
+    hil_send_ack("filter", "", false, "opcode list too long");
+    return -EINVAL;
+  }
+  strncpy(buf, argv[1], sizeof(buf) - 1);
+  buf[sizeof(buf) - 1] = '\0';
+
+  for (char *token = strtok_r(buf, ",", &saveptr); token != NULL;
+       token = strtok_r(NULL, ",", &saveptr)) {
+    if (hil_opcode_from_name(token) < 0) {
+      hil_send_ack("filter", token, false, "unknown opcode");
+      return -EINVAL;
+    }
+  }
+
+  strncpy(buf, argv[1], sizeof(buf) - 1);
+  buf[sizeof(buf) - 1] = '\0';
+  hil_filter_all(false);
+  for (char *token = strtok_r(buf, ",", &saveptr); token != NULL;
+       token = strtok_r(NULL, ",", &saveptr)) {
+    hil_filter_opcode((uint8_t)hil_opcode_from_name(token), true);
+  }
+
+  hil_send_ack("filter", argv[1], true, NULL);
+  return 0;
+}
+
 static int cmd_hil_status(const struct shell *sh, size_t argc, char **argv) {
   ARG_UNUSED(argc);
   ARG_UNUSED(argv);
@@ -2112,17 +2228,42 @@ static int cmd_hil_watch(const struct shell *sh, size_t argc, char **argv) {
   hil_set_shell(sh);
 
   if (argc < 2) {
-    hil_send_ack("watch", "", false, "usage: hil watch <add|del|clear|list|poll>");
+    hil_send_ack("watch", "", false,
+                 "usage: hil watch <add|del|clear|list|poll|period>");
     return -EINVAL;
   }
 
   if (strcmp(argv[1], "clear") == 0) {
     memset(s_hil_watches, 0, sizeof(s_hil_watches));
+    s_hil_watch_poll_ms = HIL_WATCH_POLL_MS;
     hil_send_ack("watch", "clear", true, NULL);
     hil_watch_arm_poll();
     return 0;
   }
 
+  if (strcmp(argv[1], "period") == 0) {
+    unsigned long parsed_ms;
+    char *endptr = NULL;
+
+    if (argc < 3) {
+      hil_send_ack("watch", "period", false,
+                   "usage: hil watch period <ms>");
+      return -EINVAL;
+    }
+
+    parsed_ms = strtoul(argv[2], &endptr, 0);
+    if (endptr == NULL || *endptr != '\0' ||
+        parsed_ms < HIL_WATCH_POLL_MIN_MS || parsed_ms > HIL_WATCH_POLL_MAX_MS) {
+      hil_send_ack("watch", argv[2], false, "invalid period");
+      return -EINVAL;
+    }
+
+    s_hil_watch_poll_ms = (uint32_t)parsed_ms;
+    hil_send_ack("watch", argv[2], true, NULL);
+    hil_watch_arm_poll();
+    return 0;
+  }
+
   if (strcmp(argv[1], "list") == 0) {
     bool first = true;
     shell_fprintf(sh, SHELL_NORMAL,
@@ -3199,6 +3340,8 @@ SHELL_STATIC_SUBCMD_SET_CREATE(
     SHELL_CMD_ARG(peek, NULL, "Read memory", cmd_dbg_peek, 2, 1),
     SHELL_CMD_ARG(mpeek, NULL, "Multi-read: mpeek addr:len[,addr:len...]", cmd_dbg_mpeek, 2, 0),
     SHELL_CMD_ARG(poke, NULL, "Write memory", cmd_dbg_poke, 3, 0),
+    SHELL_CMD_ARG(pokehex, NULL, "Write bytes: pokehex <addr> <hexbytes>",
+                  cmd_dbg_pokehex, 3, 0),
     SHELL_CMD_ARG(info, NULL, "VM state", cmd_dbg_info, 1, 1),
     SHELL_CMD_ARG(ticks, NULL, "System tick", cmd_dbg_ticks, 1, 1),
     SHELL_CMD_ARG(mem, NULL, "Dump memory", cmd_dbg_mem, 2, 1),
@@ -3235,6 +3378,8 @@ SHELL_STATIC_SUBCMD_SET_CREATE(
 SHELL_STATIC_SUBCMD_SET_CREATE(
     sub_hil,
     SHELL_CMD_ARG(mode, NULL, "Set debug mode", cmd_hil_mode, 2, 0),
+    SHELL_CMD_ARG(filter, NULL, "Trace only the listed opcodes (or all)",
+                  cmd_hil_filter, 2, 0),
     SHELL_CMD(status, NULL, "Show status", cmd_hil_status),
     SHELL_CMD_ARG(watch, NULL, "Manage watches", cmd_hil_watch, 2, 2),
     SHELL_CMD(reset, NULL, "Reset VM", cmd_hil_reset),
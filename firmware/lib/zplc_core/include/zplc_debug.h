@@ -48,7 +48,8 @@ extern "C" {
 typedef enum {
     HIL_MODE_OFF = 0,      /**< No debug output (production mode) */
     HIL_MODE_SUMMARY = 1,  /**< Per-cycle summaries only (~100-500 B/s) */
-    HIL_MODE_VERBOSE = 2   /**< Per-opcode trace (~5-10 KB/s) */
+    HIL_MODE_VERBOSE = 2,  /**< Per-opcode trace (~5-10 KB/s) */
+    HIL_MODE_COMPACT = 3   /**< Per-opcode trace as fixed-width hex records (~1/3 of verbose) */
 } hil_mode_t;
 
 /* ============================================================================
@@ -88,6 +89,33 @@ hil_mode_t hil_get_mode(void);
  */
 void hil_set_shell(const struct shell *sh);
 
+/**
+ * @brief Enable or disable opcode tracing for every opcode.
+ *
+ * The filter starts with all opcodes enabled.
+ *
+ * @param enabled true to trace all opcodes, false to trace none
+ */
+void hil_filter_all(bool enabled);
+
+/**
+ * @brief Enable or disable opcode tracing for a single opcode.
+ *
+ * Only affects hil_trace_opcode(); fb/task/cycle/error traces are not filtered.
+ *
+ * @param op      Opcode value (from zplc_opcode_t)
+ * @param enabled true to trace it, false to skip it
+ */
+void hil_filter_opcode(uint8_t op, bool enabled);
+
+/**
+ * @brief Look up an opcode by the name used in trace output.
+ *
+ * @param name Opcode name (e.g., "STORE32")
+ * @return Opcode value, or -1 if the name is unknown
+ */
+int hil_opcode_from_name(const char *name);
+
 /* ============================================================================
  * Trace Functions
  * ============================================================================ */
@@ -97,7 +125,11 @@ void hil_set_shell(const struct shell *sh);
  *
  * Emits: {"t":"opcode","op":"ADD","pc":18,"sp":2,"tos":7}
  *
- * Only outputs in HIL_MODE_VERBOSE.
+ * In HIL_MODE_COMPACT emits a fixed-width record instead:
+ *   ~OOPPPPSSTTTTTTTT  (op, pc, sp, tos as uppercase hex, tos two's complement)
+ *
+ * Only outputs in HIL_MODE_VERBOSE and HIL_MODE_COMPACT, and only for
+ * opcodes enabled in the filter (see hil_filter_opcode()).
  *
  * @param op    Opcode value (from zplc_opcode_t)
  * @param pc    Program counter BEFORE execution
@@ -245,6 +277,9 @@ const char *hil_error_name(uint8_t code);
 #define hil_set_mode(mode)           ((void)0)
 #define hil_get_mode()               (HIL_MODE_OFF)
 #define hil_set_shell(sh)            ((void)0)
+#define hil_filter_all(enabled)      ((void)0)
+#define hil_filter_opcode(op, en)    ((void)0)
+#define hil_opcode_from_name(name)   (-1)
 
 #define hil_trace_opcode(op, pc, sp, tos)                  ((void)0)
 #define hil_trace_fb(name, id, q, et_or_cv)                ((void)0)
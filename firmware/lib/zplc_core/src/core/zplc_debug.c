@@ -33,6 +33,12 @@ static hil_mode_t hil_mode = HIL_MODE_OFF;
 /** Shell instance for output */
 static const struct shell *hil_shell = NULL;
 
+/** Opcode trace filter: one bit per opcode, all enabled by default */
+static uint32_t hil_op_filter[256 / 32] = {
+    0xFFFFFFFFu, 0xFFFFFFFFu, 0xFFFFFFFFu, 0xFFFFFFFFu,
+    0xFFFFFFFFu, 0xFFFFFFFFu, 0xFFFFFFFFu, 0xFFFFFFFFu,
+};
+
 /* ============================================================================
  * Opcode Name Lookup Table
  * ============================================================================ */
@@ -190,6 +196,34 @@ void hil_set_shell(const struct shell *sh)
     hil_shell = sh;
 }
 
+void hil_filter_all(bool enabled)
+{
+    memset(hil_op_filter, enabled ? 0xFF : 0x00, sizeof(hil_op_filter));
+}
+
+void hil_filter_opcode(uint8_t op, bool enabled)
+{
+    if (enabled) {
+        hil_op_filter[op >> 5] |= (1u << (op & 31u));
+    } else {
+        hil_op_filter[op >> 5] &= ~(1u << (op & 31u));
+    }
+}
+
+int hil_opcode_from_name(const char *name)
+{
+    if (name == NULL || strcmp(name, "???") == 0) {
+        return -1;
+    }
+
+    for (int op = 0; op < 256; op++) {
+        if (strcmp(hil_opcode_name((uint8_t)op), name) == 0) {
+            return op;
+        }
+    }
+    return -1;
+}
+
 /* ============================================================================
  * Internal Output Helper
  * ============================================================================ */
@@ -214,7 +248,20 @@ static inline void hil_output(void)
 
 void hil_trace_opcode(uint8_t op, uint16_t pc, uint8_t sp, int32_t tos)
 {
-    if (hil_mode != HIL_MODE_VERBOSE || hil_shell == NULL) {
+    if ((hil_mode != HIL_MODE_VERBOSE && hil_mode != HIL_MODE_COMPACT) ||
+        hil_shell == NULL) {
+        return;
+    }
+
+    /* Skip filtered opcodes before paying for formatting and shell output */
+    if ((hil_op_filter[op >> 5] & (1u << (op & 31u))) == 0) {
+        return;
+    }
+
+    if (hil_mode == HIL_MODE_COMPACT) {
+        snprintf(hil_buf, sizeof(hil_buf), "~%02X%04X%02X%08X",
+                 op, pc, sp, (uint32_t)tos);
+        hil_output();
         return;
     }
 
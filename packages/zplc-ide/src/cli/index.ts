@@ -8,6 +8,7 @@ import { transpileILToST } from '../compiler/il/ilToST';
 import { parseIL } from '../compiler/il/parser';
 import * as fs from "fs";
 import * as path from "path";
+import * as readline from "readline";
 import { execSync } from "child_process";
 import { fileURLToPath } from "url";
 
@@ -57,6 +58,9 @@ async function main() {
       case "compile":
         await handleCompile(positionals[1], values);
         break;
+      case "compile-server":
+        await handleCompileServer();
+        break;
       case "upload":
         console.error("Upload not implemented in this minimal CLI version");
         process.exit(1);
@@ -81,6 +85,7 @@ Usage:
 
 Commands:
   compile <file>    Compile source code to binary (.zplc)
+  compile-server    Compile {"src","dst"} JSON requests read line by line from stdin
   upload <file>     Upload bytecode to device
 
 Options:
@@ -190,4 +195,39 @@ async function handleCompile(file: string, options: any) {
     console.log(assembly);
   }
 }
+
+/**
+ * Long-lived compile loop for test tooling: one JSON request per stdin line,
+ * {"src": "<file>", "dst": "<output>"}, answered with one JSON line on stdout,
+ * {"success": true|false, "error"?: string, "log": string}. Pays Bun's startup
+ * and module loading once instead of once per file.
+ */
+async function handleCompileServer() {
+  const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  const originalLog = console.log;
+
+  for await (const line of rl) {
+    if (!line.trim()) continue;
+
+    // Compile logs go into the reply, stdout is reserved for the protocol
+    const log: string[] = [];
+    console.log = (...args: unknown[]) => { log.push(args.join(' ')); };
+    let reply: Record<string, unknown>;
+    try {
+      const request = JSON.parse(line);
+      await handleCompile(request.src, { language: "ST", output: request.dst });
+      reply = { success: true, log: log.join('\n') };
+    } catch (err) {
+      reply = {
+        success: false,
+        error: err instanceof Error ? err.message : String(err),
+        log: log.join('\n'),
+      };
+    } finally {
+      console.log = originalLog;
+    }
+    process.stdout.write(JSON.stringify(reply) + '\n');
+  }
+}
+
 main();
@@ -1,5 +1,4 @@
 import serial
-import time
 import glob
 import sys
 
@@ -22,15 +21,13 @@ def check_alive():
         # Send simple Enter to wake up REPL
         print("Sending CR...")
         ser.write(b"\r\n")
-        time.sleep(0.5)
-        resp = ser.read_all().decode(errors="ignore")
+        resp = ser.read_until(b"zplc:~$").decode(errors="ignore")
         print(f"Response 1: {repr(resp)}")
 
         # Send specific command
         print("Sending 'help'...")
         ser.write(b"help\r\n")
-        time.sleep(0.5)
-        resp = ser.read_all().decode(errors="ignore")
+        resp = ser.read_until(b"zplc:~$").decode(errors="ignore")
         print(f"Response 2: {repr(resp)}")
 
         ser.close()
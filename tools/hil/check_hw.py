@@ -11,14 +11,13 @@ def check_connection():
 
         print("Sending wakeup CRs...")
         ser.write(b"\r\n\r\n")
-        time.sleep(0.5)
+        ser.read_until(b"zplc:~$")
         ser.reset_input_buffer()
 
         print("Sending help...")
         ser.write(b"help\r\n")
-        time.sleep(1.0)
 
-        resp = ser.read_all().decode("utf-8", errors="ignore")
+        resp = ser.read_until(b"zplc:~$").decode("utf-8", errors="ignore")
         print(f"Response len: {len(resp)}")
         print(f"Response: {resp[:100]}...")
 
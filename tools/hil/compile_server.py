@@ -0,0 +1,55 @@
+"""
+Client for the CLI's compile-server mode (packages/zplc-ide/src/cli/index.ts).
+One long-lived bun process compiles every file, so Bun's startup and the
+compiler's module loading are paid once instead of once per file.
+"""
+
+import json
+import subprocess
+import threading
+
+
+class CompileServer:
+    def __init__(self, cli_path):
+        self.proc = subprocess.Popen(
+            ["bun", cli_path, "compile-server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        # Un pedido a la vez: las respuestas llegan en orden por stdout
+        self.lock = threading.Lock()
+
+    def compile(self, src, dst):
+        """
+        Compiles src into dst. Returns (ok, output), output being the CLI log
+        plus the error message on failure. Raises RuntimeError if the server
+        is gone (callers fall back to one bun per file).
+        """
+        with self.lock:
+            try:
+                self.proc.stdin.write(json.dumps({"src": src, "dst": dst}) + "\n")
+                self.proc.stdin.flush()
+                line = self.proc.stdout.readline()
+            except (BrokenPipeError, OSError) as e:
+                raise RuntimeError(f"compile-server unavailable: {e}")
+        if not line:
+            raise RuntimeError("compile-server exited")
+        try:
+            reply = json.loads(line)
+        except json.JSONDecodeError:
+            raise RuntimeError(f"compile-server bad reply: {line.strip()}")
+
+        output = reply.get("log", "")
+        if not reply.get("success"):
+            output += "\n" + reply.get("error", "")
+        return bool(reply.get("success")), output
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
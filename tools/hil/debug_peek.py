@@ -8,8 +8,7 @@ time.sleep(1)
 def send(cmd):
     print(f"SEND: {cmd}")
     ser.write(f"{cmd}\r\n".encode())
-    time.sleep(0.5)
-    resp = ser.read(ser.in_waiting).decode("utf-8", errors="ignore")
+    resp = ser.read_until(b"zplc:~$").decode("utf-8", errors="ignore")
     print(f"RECV: {resp}")
     return resp
 
@@ -1,7 +1,31 @@
 import os
 import struct
+import threading
 import time
-from zplc_tester import ZPLCTester
+from concurrent.futures import ThreadPoolExecutor
+from zplc_tester import ZPLCTester, hil_ports
+
+# Precompiled little-endian formats used by the expect_* helpers
+_STRUCTS = {
+    fmt: struct.Struct(fmt)
+    for fmt in ("<b", "<B", "<h", "<H", "<i", "<I", "<f", "<d")
+}
+
+# Byte width per struct format character
+_STRUCT_SIZES = {"b": 1, "B": 1, "h": 2, "H": 2, "i": 4, "I": 4, "f": 4, "d": 8}
+
+# batch_expect field kinds -> struct format
+_BATCH_KINDS = {
+    "bool": "<B",
+    "byte": "<B",
+    "int8": "<b",
+    "int16": "<h",
+    "uint16": "<H",
+    "int32": "<i",
+    "uint32": "<I",
+    "real": "<f",
+    "lreal": "<d",
+}
 
 
 class LanguageTester(ZPLCTester):
@@ -10,11 +34,18 @@ class LanguageTester(ZPLCTester):
     Provides helper methods for common verification patterns across IL, LD, FBD, SFC.
     """
 
-    def compile_and_run(self, source_file, duration=1.0, reset=True):
-        """Compiles any supported source file and runs it on the device."""
+    def compile_and_run(self, source_file, duration=1.0, reset=True, compiled=None):
+        """
+        Compiles any supported source file and runs it on the device.
+        compiled: optional Future already compiling source_file (see
+        compile_and_run_many); its result is used instead of compiling here.
+        """
         print(f"Compiling {source_file}...")
         # compile_st in base class handles extension resolution and paths
-        bytecode = self.compile_st(source_file)
+        if compiled is not None:
+            bytecode = compiled.result()
+        else:
+            bytecode = self.compile_st(source_file)
 
         if reset:
             self.reset_state()
@@ -24,6 +55,54 @@ class LanguageTester(ZPLCTester):
         print(f"Running for {duration}s...")
         self.start_and_wait(duration=duration)
 
+    def compile_and_run_many(self, cases, fail_fast=None, stop=None):
+        """
+        Runs (title, source_file, duration, check) cases back to back on this
+        tester. Only the first case pays the full reset_state(); later ones
+        rely on upload_bytecode's stop + reset to replace the program.
+        check(tester) returns a bool. Returns one result per case.
+
+        The next case's source is compiled on a helper thread while the
+        current one runs, so the compiler and the serial link overlap.
+
+        With fail_fast (default: ZPLC_FAIL_FAST=1) the first failure skips the
+        remaining cases, which count as failed. `stop` (a threading.Event) is
+        set on that failure and checked before each case, so other boards
+        running the same suite stop too.
+        """
+        if fail_fast is None:
+            fail_fast = fail_fast_enabled()
+        results = []
+        with ThreadPoolExecutor(max_workers=1) as compiler:
+            pending = compiler.submit(self.compile_st, cases[0][1]) if cases else None
+            for i, (title, source_file, duration, check) in enumerate(cases):
+                if stop is not None and stop.is_set():
+                    break
+                compiled = pending
+                if i + 1 < len(cases):
+                    pending = compiler.submit(self.compile_st, cases[i + 1][1])
+                else:
+                    pending = None
+                print(f"\n--- TEST: {title} ---")
+                try:
+                    self.compile_and_run(
+                        source_file, duration=duration, reset=(i == 0), compiled=compiled
+                    )
+                    results.append(bool(check(self)))
+                except Exception as e:
+                    print(f"FAILED: {e}")
+                    results.append(False)
+                if fail_fast and not results[-1]:
+                    if stop is not None:
+                        stop.set()
+                    break
+            if pending is not None:
+                pending.cancel()
+        skipped = len(cases) - len(results)
+        if skipped:
+            print(f"FAIL-FAST: skipping {skipped} remaining case(s)")
+        return results + [False] * skipped
+
     def compile_language_matrix(self, sources):
         """Compile a canonical language suite and return per-language results."""
         results = {}
@@ -43,7 +122,7 @@ class LanguageTester(ZPLCTester):
 
     def start_running(self):
         """Starts the PLC runtime without blocking."""
-        self.send("zplc hil mode off")
+        self.set_hil_mode("off")
         self.ser.reset_input_buffer()
         self.send("zplc start")
         time.sleep(0.1)  # Give it a moment to start
@@ -54,36 +133,72 @@ class LanguageTester(ZPLCTester):
 
     def poke(self, address, value, size=1):
         """Writes a value to memory address (hex). value is int."""
-        data = bytearray()
         if size == 1:
-            data.append(value & 0xFF)
+            hex_str = f"{value & 0xFF:02x}"
         elif size == 2:
-            data.extend(struct.pack("<H", value))
+            hex_str = struct.pack("<H", value).hex()
         elif size == 4:
-            data.extend(struct.pack("<I", value))
+            hex_str = struct.pack("<I", value).hex()
+        else:
+            hex_str = ""
 
-        hex_str = data.hex()
-        self.send(f"zplc dbg poke {hex(address)} {hex_str}")
+        self.send(f"zplc dbg poke 0x{address:x} {hex_str}")
 
     def expect_memory(self, address, fmt, expected_value, description="Value"):
         """
         Reads memory and asserts expected value.
         fmt: struct format string (e.g. '<h' for short, '<f' for float)
         """
-        size_map = {"b": 1, "B": 1, "h": 2, "H": 2, "i": 4, "I": 4, "f": 4, "d": 8}
-        # Get the last char of fmt as type indicator
-        fmt_char = fmt[-1] if fmt[-1] in size_map else fmt[-2]
-        size = size_map.get(fmt_char, 2)
+        # The last char of fmt is the type indicator
+        size = _STRUCT_SIZES.get(fmt[-1], 2)
 
         mem = self.peek(address, size)
         if len(mem) < size:
             print(
-                f"FAIL: Incomplete read at {hex(address)} (Got {len(mem)} bytes, need {size})"
+                f"FAIL: Incomplete read at 0x{address:x} (Got {len(mem)} bytes, need {size})"
             )
             return False
 
-        val = struct.unpack(fmt, bytearray(mem))[0]
+        unpacker = _STRUCTS.get(fmt) or struct.Struct(fmt)
+        val = unpacker.unpack_from(mem)[0]
+        return self._report_value(val, fmt, expected_value, description)
 
+    def batch_expect(self, spec, base=0x1000):
+        """
+        Checks several values with a single peek. Assumes OPI memory (adds 0x1000).
+        spec: list of (kind, offset, expected_value, description), kind one of
+        _BATCH_KINDS ("int16", "int32", "real", "bool", ...); "bool" checks bit 0.
+        Only the span between the lowest and highest field is read.
+        """
+        lo = min(off for _, off, _, _ in spec)
+        hi = max(
+            off + _STRUCT_SIZES[_BATCH_KINDS[kind][-1]] for kind, off, _, _ in spec
+        )
+        address = base + lo
+
+        mem = self.peek(address, hi - lo)
+        if len(mem) < hi - lo:
+            print(
+                f"FAIL: Incomplete read at 0x{address:x} (Got {len(mem)} bytes, need {hi - lo})"
+            )
+            return False
+
+        ok = True
+        for kind, off, expected_value, description in spec:
+            if kind == "bool":
+                val = bool(mem[off - lo] & 1)
+                match = val == bool(expected_value)
+                status = "PASS ✅" if match else "FAIL ❌"
+                print(f"{description}: {val} (Exp: {expected_value}) - {status}")
+                ok &= match
+                continue
+            fmt = _BATCH_KINDS[kind]
+            val = _STRUCTS[fmt].unpack_from(mem, off - lo)[0]
+            ok &= self._report_value(val, fmt, expected_value, description)
+        return ok
+
+    def _report_value(self, val, fmt, expected_value, description):
+        """Compares a decoded value against the expectation and prints the result."""
         # Handle float comparison with tolerance
         if "f" in fmt or "d" in fmt:
             match = abs(val - expected_value) < 0.001
@@ -104,15 +219,14 @@ class LanguageTester(ZPLCTester):
         real_addr = address + 0x1000
         mem = self.peek(real_addr, 1)
         if not mem:
-            print(f"FAIL: Read failed at {hex(real_addr)}")
+            print(f"FAIL: Read failed at 0x{real_addr:x}")
             return False
 
-        val = (mem[0] >> bit_offset) & 1
-        expected = 1 if expected_bool else 0
-        match = val == expected
+        val = bool(mem[0] & (1 << bit_offset))
+        match = val == bool(expected_bool)
 
         status = "PASS ✅" if match else "FAIL ❌"
-        print(f"{description}: {bool(val)} (Exp: {expected_bool}) - {status}")
+        print(f"{description}: {val} (Exp: {expected_bool}) - {status}")
         return match
 
     def expect_int16(self, address, expected_value, description="Int16"):
@@ -123,3 +237,46 @@ class LanguageTester(ZPLCTester):
 
     def expect_real(self, address, expected_value, description="Real"):
         return self.expect_memory(address + 0x1000, "<f", expected_value, description)
+
+
+def fail_fast_enabled():
+    """True when ZPLC_FAIL_FAST=1: suites stop at their first failing case."""
+    return os.environ.get("ZPLC_FAIL_FAST") == "1"
+
+
+def run_cases(cases, tester=None):
+    """
+    Runs a suite's (title, source_file, duration, check) cases and returns the
+    results in case order. Uses `tester` when given; otherwise, with more than
+    one board in ZPLC_PORTS the cases are dealt round-robin to one thread and
+    tester per board (serial I/O releases the GIL), else a tester is opened
+    on the default port for the duration of the call. Honours ZPLC_FAIL_FAST
+    (see compile_and_run_many); a failure on one board stops the others.
+    """
+    if tester is not None:
+        return tester.compile_and_run_many(cases)
+
+    ports = hil_ports()
+    if len(ports) < 2:
+        tester = LanguageTester()
+        try:
+            return tester.compile_and_run_many(cases)
+        finally:
+            tester.close()
+
+    stop = threading.Event()
+
+    def run_shard(shard):
+        board = LanguageTester(port=ports[shard])
+        try:
+            return board.compile_and_run_many(cases[shard :: len(ports)], stop=stop)
+        finally:
+            board.close()
+
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        shards = list(pool.map(run_shard, range(len(ports))))
+
+    results = [False] * len(cases)
+    for shard, shard_results in enumerate(shards):
+        results[shard :: len(ports)] = shard_results
+    return results
@@ -1,5 +1,4 @@
 import serial
-import time
 import glob
 
 
@@ -21,15 +20,14 @@ def rescue():
         print("Sending stops...")
         for _ in range(10):
             ser.write(b"zplc stop\r\n")
-            time.sleep(0.1)
-            resp = ser.read_all()
+            resp = ser.read_until(b"zplc:~$")
             if resp:
                 print(f"Response: {resp}")
 
         print("Sending reset...")
         ser.write(b"zplc reset\r\n")
-        time.sleep(0.5)
-        print(ser.read_all())
+        ser.timeout = 0.5
+        print(ser.read_until(b"zplc:~$"))
 
         ser.close()
     except Exception as e:
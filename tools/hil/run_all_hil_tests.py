@@ -1,6 +1,8 @@
 import sys
 import os
 import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -17,6 +19,57 @@ from test_conversion import test_conversion
 from test_float_math import test_float_math
 from test_strings import test_strings
 from test_errors import test_errors
+from zplc_tester import ZPLCTester, hil_ports
+
+# One open tester per process, shared by every test it runs
+_tester = None
+
+
+def _shared_tester():
+    global _tester
+    if _tester is None:
+        _tester = ZPLCTester()
+    return _tester
+
+
+def run_test(name, func):
+    try:
+        print(f"\n>>> Running {name}...")
+        func(_shared_tester())
+        return "SUCCESS ✅"
+    except Exception as e:
+        print(f"\n❌ ERROR in {name}: {e}")
+        return "FAILED ❌"
+
+
+def _bind_worker_port(port_queue):
+    # Each worker process owns exactly one board; ZPLCTester() reads ZPLC_PORT
+    os.environ["ZPLC_PORT"] = port_queue.get()
+
+
+def run_tests(test_suites):
+    """
+    Runs the tests serially on the default board, or spread across boards when
+    ZPLC_PORTS lists more than one serial port (one worker process per board).
+    """
+    ports = hil_ports()
+    if len(ports) < 2:
+        return [(name, run_test(name, func)) for name, func in test_suites]
+
+    print(f"Running tests in parallel on {len(ports)} boards: {', '.join(ports)}")
+    port_queue = multiprocessing.Manager().Queue()
+    for port in ports:
+        port_queue.put(port)
+
+    with ProcessPoolExecutor(
+        max_workers=len(ports),
+        initializer=_bind_worker_port,
+        initargs=(port_queue,),
+    ) as pool:
+        futures = [
+            (name, pool.submit(run_test, name, func)) for name, func in test_suites
+        ]
+        return [(name, future.result()) for name, future in futures]
 
 
 def run_all():
@@ -40,16 +93,9 @@ def run_all():
         ("Error Conditions", test_errors),
     ]
 
-    results = []
-
-    for name, func in test_suites:
-        try:
-            print(f"\n>>> Running {name}...")
-            func()
-            results.append((name, "SUCCESS ✅"))
-        except Exception as e:
-            print(f"\n❌ ERROR in {name}: {e}")
-            results.append((name, "FAILED ❌"))
+    results = run_tests(test_suites)
+    if _tester is not None:
+        _tester.close()
 
     print("\n\n====================================================")
     print("                FINAL TEST REPORT                   ")
@@ -2,19 +2,53 @@ import sys
 import os
 import time
 import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from zplc_tester import hil_ports
+
+# One open tester per process, shared by every suite it runs
+_tester = None
+
+
+def _shared_tester():
+    global _tester
+    if _tester is None:
+        from language_tester import LanguageTester
+
+        _tester = LanguageTester()
+    return _tester
+
+
+# Loaded suite modules: path -> (mtime_ns, module)
+_MODULE_CACHE = {}
+
+
+def _load_suite(module_path):
+    """Imports a suite once per source mtime, under its own module name."""
+    mtime = os.stat(module_path).st_mtime_ns
+    cached = _MODULE_CACHE.get(module_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    name = "zplc_hil_" + os.path.splitext(os.path.basename(module_path))[0]
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    _MODULE_CACHE[module_path] = (mtime, module)
+    return module
+
 
 def run_suite(module_path, suite_name):
     print(f"\n>>> Running Suite: {suite_name}...")
     try:
-        spec = importlib.util.spec_from_file_location("module.name", module_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        module = _load_suite(module_path)
         if hasattr(module, "run_tests"):
-            return module.run_tests()
+            return module.run_tests(_shared_tester())
         else:
             print(f"⚠️  Module {suite_name} has no run_tests() function.")
             return False
@@ -26,6 +60,36 @@ def run_suite(module_path, suite_name):
         return False
 
 
+def _bind_worker_port(port_queue):
+    # Each worker process owns exactly one board for its whole lifetime
+    os.environ["ZPLC_PORT"] = port_queue.get()
+
+
+def run_suites(active_suites):
+    """
+    Runs suites serially on the default board, or sharded across boards when
+    ZPLC_PORTS lists more than one serial port (one worker process per board).
+    """
+    ports = hil_ports()
+    if len(ports) < 2:
+        return [(name, run_suite(fpath, name)) for fpath, name in active_suites]
+
+    print(f"Running suites in parallel on {len(ports)} boards: {', '.join(ports)}")
+    port_queue = multiprocessing.Manager().Queue()
+    for port in ports:
+        port_queue.put(port)
+
+    with ProcessPoolExecutor(
+        max_workers=len(ports),
+        initializer=_bind_worker_port,
+        initargs=(port_queue,),
+    ) as pool:
+        futures = [
+            (name, pool.submit(run_suite, fpath, name)) for fpath, name in active_suites
+        ]
+        return [(name, future.result()) for name, future in futures]
+
+
 def main():
     print("====================================================")
     print("       ZPLC MULTI-LANGUAGE HIL TEST RUNNER          ")
@@ -53,10 +117,9 @@ def main():
         print("No test suites found! (Create test_*_suite.py files)")
         sys.exit(0)
 
-    results = []
-    for fpath, name in active_suites:
-        success = run_suite(fpath, name)
-        results.append((name, success))
+    results = run_suites(active_suites)
+    if _tester is not None:
+        _tester.close()
 
     print("\n\n====================================================")
     print("                FINAL REPORT                        ")
@@ -1,6 +1,8 @@
+import select
 import serial
 import time
 
+# timeout bounds each prompt wait; send() returns as soon as the prompt arrives
 ser = serial.Serial("/dev/tty.usbmodem101", 115200, timeout=1)
 time.sleep(1)
 
@@ -8,7 +10,11 @@ time.sleep(1)
 def send(cmd):
     print(f"SEND: {cmd}")
     ser.write(f"{cmd}\r\n".encode())
-    time.sleep(0.1)
+    resp = ser.read_until(b"zplc:~$").decode("utf-8", errors="ignore")
+    for line in resp.splitlines():
+        line = line.strip()
+        if line:
+            print(f"RECV: {line}")
 
 
 send("zplc stop")
@@ -19,10 +25,25 @@ send("zplc data 00000001")  # NOP, NOP, NOP, HALT
 send("zplc start")
 
 print("READING (5s)...")
-start = time.time()
-while time.time() - start < 5:
-    line = ser.readline().decode("utf-8", errors="ignore").strip()
-    if line:
-        print(f"RECV: {line}")
+# Wait on the port fd with the remaining budget and drain whatever has arrived
+deadline = time.time() + 5
+pending = b""
+while True:
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        break
+    ready, _, _ = select.select([ser.fileno()], [], [], remaining)
+    if not ready:
+        break
+    pending += ser.read(ser.in_waiting or 1)
+    *lines, pending = pending.split(b"\n")
+    for line in lines:
+        line = line.decode("utf-8", errors="ignore").strip()
+        if line:
+            print(f"RECV: {line}")
+
+line = pending.decode("utf-8", errors="ignore").strip()
+if line:
+    print(f"RECV: {line}")
 
 ser.close()
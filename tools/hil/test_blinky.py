@@ -1,5 +1,4 @@
 from zplc_tester import ZPLCTester
-import time
 
 
 def test_blinky():
@@ -16,48 +15,34 @@ def test_blinky():
     bytecode = tester.compile_st(st_file)
     tester.upload_bytecode(bytecode)
 
-    # 2. Correr y monitorear (no podemos hacer 'wait' porque queremos ver el cambio en vivo)
-    # Pero como no tenemos monitor en tiempo real por ahora, capturamos snapshots con peek
+    # 2. Correr y monitorear en vivo: el firmware muestrea GP0/GP1 cada 10ms
+    # (zplc hil watch) y solo emite un evento cuando el valor cambia
 
-    print("Running blinky test (sampling for 5s)...")
-    tester.send("zplc hil mode off")
-    tester.send("zplc start")
+    print("Running blinky test (streaming for 5s)...")
+    events = tester.watch_stream(
+        [(0x1000, "u8"), (0x1001, "u8")], duration=5.0, period_ms=10
+    )
 
-    samples = []
-    start_time = time.time()
+    # Analizar
+    # GP0 (Slow): Should change every ~0.5s
+    # GP1 (Fast): Should change every ~0.1s
 
-    # Muestrear cada 100ms
-    while time.time() - start_time < 5.0:
-        data = tester.peek(0x1000, 2)  # Read GP0 and GP1
-        if len(data) >= 2:
-            timestamp = time.time() - start_time
-            samples.append((timestamp, data[0], data[1]))
-        time.sleep(0.1)  # Sampling rate ~10Hz
+    last = {}
+    changes = {0x1000: 0, 0x1001: 0}
 
-    tester.send("zplc stop")
+    print("\n--- WATCH EVENTS ---")
+    print("Time(s) | Output     | Value")
+    print("--------|------------|------")
+    for t, addr, val in events:
+        name = "Slow (GP0)" if addr == 0x1000 else "Fast (GP1)"
+        print(f"{t:.2f}    | {name} | {val}")
 
-    # Analizar
-    # GP0 (Slow): Should change every ~0.5s
-    # GP1 (Fast): Should change every ~0.1s (might miss changes with 10Hz sampling)
-
-    changes_slow = 0
-    changes_fast = 0
-    last_slow = samples[0][1]
-    last_fast = samples[0][2]
-
-    print("\n--- SAMPLE DATA ---")
-    print("Time(s) | Slow (GP0) | Fast (GP1)")
-    print("--------|------------|-----------")
-    for t, slow, fast in samples:
-        print(f"{t:.2f}    | {slow}          | {fast}")
-
-        if slow != last_slow:
-            changes_slow += 1
-            last_slow = slow
-
-        if fast != last_fast:
-            changes_fast += 1
-            last_fast = fast
+        if addr in last and val != last[addr]:
+            changes[addr] += 1
+        last[addr] = val
+
+    changes_slow = changes[0x1000]
+    changes_fast = changes[0x1001]
 
     print("\n--- RESULTS ---")
     print(f"Slow Toggle Count: {changes_slow} (Expected ~5-10 for 5s)")
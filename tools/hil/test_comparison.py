@@ -1,91 +1,96 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, Op, bc, push8, push32
 
+# Programs are built once at import time as bytes
+EQ_10_10 = bc(push8(10), push8(10), Op.EQ, Op.HALT)
+EQ_10_20 = bc(push8(10), push8(20), Op.EQ, Op.HALT)
+NE_10_20 = bc(push8(10), push8(20), Op.NE, Op.HALT)
+NE_10_10 = bc(push8(10), push8(10), Op.NE, Op.HALT)
+LT_10_20 = bc(push8(10), push8(20), Op.LT, Op.HALT)
+LT_NEG10_0 = bc(push8(-10), push8(0), Op.LT, Op.HALT)  # -10 < 0
+LE_10_10 = bc(push8(10), push8(10), Op.LE, Op.HALT)
+GT_20_10 = bc(push8(20), push8(10), Op.GT, Op.HALT)
+GE_10_10 = bc(push8(10), push8(10), Op.GE, Op.HALT)
+# 1 < 0xFFFFFFFF (unsigned) is TRUE (1)
+LTU_1_MAX = bc(push8(1), push32(0xFFFFFFFF), Op.LTU, Op.HALT)
+# 0xFFFFFFFF > 1 (unsigned) is TRUE (1)
+GTU_MAX_1 = bc(push32(0xFFFFFFFF), push8(1), Op.GTU, Op.HALT)
 
-def test_comparison():
-    tester = ZPLCTester()
-    OP = tester.OP
+
+def test_comparison(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     print("\n--- Running Comparison Tests ---")
 
     # 1. EQ
     print("Test EQ...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 10, OP["EQ"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
-        bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 20, OP["EQ"], OP["HALT"]]
-        if tester.get_last_tos(tester.run_bytecode(bytecode)) == 0:
-            print("PASS")
-        else:
-            print("FAIL (10==20)")
-    else:
+    results = tester.run_many([(EQ_10_10, 1), (EQ_10_20, 0)])
+    if results == [1, 0]:
+        print("PASS")
+    elif len(results) == 1:
         print("FAIL (10==10)")
+    else:
+        print("FAIL (10==20)")
 
     # 2. NE
     print("Test NE...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 20, OP["NE"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
-        bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 10, OP["NE"], OP["HALT"]]
-        if tester.get_last_tos(tester.run_bytecode(bytecode)) == 0:
-            print("PASS")
-        else:
-            print("FAIL (10!=10)")
-    else:
+    results = tester.run_many([(NE_10_20, 1), (NE_10_10, 0)])
+    if results == [1, 0]:
+        print("PASS")
+    elif len(results) == 1:
         print("FAIL (10!=20)")
+    else:
+        print("FAIL (10!=10)")
 
     # 3. LT (Signed)
     print("Test LT...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 20, OP["LT"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
-        bytecode = [OP["PUSH8"], 0xF6, OP["PUSH8"], 0, OP["LT"], OP["HALT"]]  # -10 < 0
-        if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
-            print("PASS")
-        else:
-            print("FAIL (-10 < 0)")
-    else:
+    results = tester.run_many([(LT_10_20, 1), (LT_NEG10_0, 1)])
+    if results == [1, 1]:
+        print("PASS")
+    elif len(results) == 1:
         print("FAIL (10 < 20)")
+    else:
+        print("FAIL (-10 < 0)")
 
     # 4. LE
     print("Test LE...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 10, OP["LE"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
+    if tester.get_last_tos(tester.run_bytecode(LE_10_10)) == 1:
         print("PASS")
     else:
         print("FAIL")
 
     # 5. GT
     print("Test GT...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 20, OP["PUSH8"], 10, OP["GT"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
+    if tester.get_last_tos(tester.run_bytecode(GT_20_10)) == 1:
         print("PASS")
     else:
         print("FAIL")
 
     # 6. GE
     print("Test GE...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 10, OP["GE"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
+    if tester.get_last_tos(tester.run_bytecode(GE_10_10)) == 1:
         print("PASS")
     else:
         print("FAIL")
 
     # 7. LTU (Unsigned)
     print("Test LTU...", end="", flush=True)
-    # 1 < 0xFFFFFFFF (unsigned) is TRUE (1)
-    bytecode = [OP["PUSH8"], 1, OP["PUSH32"]] + [0xFF] * 4 + [OP["LTU"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
+    tos, _, _ = tester.last_state(tester.run_bytecode(LTU_1_MAX))
+    if tos == 1:
         print("PASS")
     else:
-        print(f"FAIL (tos={tester.get_last_tos(tester.run_bytecode(bytecode))})")
+        print(f"FAIL (tos={tos})")
 
     # 8. GTU (Unsigned)
     print("Test GTU...", end="", flush=True)
-    # 0xFFFFFFFF > 1 (unsigned) is TRUE (1)
-    bytecode = [OP["PUSH32"]] + [0xFF] * 4 + [OP["PUSH8"], 1, OP["GTU"], OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 1:
+    if tester.get_last_tos(tester.run_bytecode(GTU_MAX_1)) == 1:
         print("PASS")
     else:
         print("FAIL")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,5 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, h2i
 import time
-import struct
-
-
-def h2i(bytes_list):
-    """Convierte 2 bytes (list) a int 16-bit signed."""
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
 
 
 def test_complex():
@@ -40,7 +32,7 @@ def test_complex():
         tester.close()
         return
 
-    res_x = h2i(opi_data[0:2])
+    res_x = h2i(opi_data, 0)
 
     print("\n--- RESULTS ---")
     print(f"Matrix Diag Sum: {res_x} (Expected: 50) {'✅' if res_x == 50 else '❌'}")
@@ -1,91 +1,76 @@
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, Op, bc, push8, op_addr
 
+# 0: PUSH8 10
+# 2: JMP 7
+# 5: PUSH8 20 (skipped)
+# 7: HALT
+JMP_ABS = bc(push8(10), op_addr(Op.JMP, 7), push8(20), Op.HALT)
 
-def test_control_flow():
-    tester = ZPLCTester()
-    OP = tester.OP
+# 0: PUSH8 30
+# 2: JR 2 (Skip next instruction, which is 2 bytes long)
+# 4: PUSH8 40
+# 6: HALT
+JR_REL = bc(push8(30), Op.JR, 2, push8(40), Op.HALT)
+
+JZ_TAKEN = bc(push8(0), op_addr(Op.JZ, 7), push8(99), Op.HALT)
+JZ_NOT_TAKEN = bc(push8(1), op_addr(Op.JZ, 7), push8(99), Op.HALT)
+
+# 0: CALL 5
+# 3: HALT
+# 4: NOP (padding)
+# 5: PUSH8 42
+# 7: RET
+CALL_RET = bc(op_addr(Op.CALL, 5), Op.HALT, Op.NOP, push8(42), Op.RET)
+
+
+def test_control_flow(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     print("\n--- Running Control Flow Tests ---")
 
     # 1. JMP (Absolute)
-    # 0: PUSH8 10
-    # 2: JMP 6
-    # 5: PUSH8 20 (skipped)
-    # 7: HALT
     print("Test JMP (Absolute)...", end="", flush=True)
-    bytecode = [
-        OP["PUSH8"],
-        10,
-        OP["JMP"],
-        0x07,
-        0x00,  # Jump to offset 7
-        OP["PUSH8"],
-        20,
-        OP["HALT"],
-    ]
-    traces = tester.run_bytecode(bytecode)
+    tos, sp, _ = tester.last_state(tester.run_bytecode(JMP_ABS))
     # Stack should only have 10
-    if tester.get_last_tos(traces) == 10 and tester.get_last_sp(traces) == 1:
+    if tos == 10 and sp == 1:
         print("PASS")
     else:
-        print(
-            f"FAIL (tos={tester.get_last_tos(traces)}, sp={tester.get_last_sp(traces)})"
-        )
+        print(f"FAIL (tos={tos}, sp={sp})")
 
     # 2. JR (Relative)
-    # 0: PUSH8 30
-    # 2: JR 2 (Skip next instruction, which is 2 bytes long)
-    # 4: PUSH8 40
-    # 6: HALT
     print("Test JR (Relative)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 30, OP["JR"], 0x02, OP["PUSH8"], 40, OP["HALT"]]
-    traces = tester.run_bytecode(bytecode)
-    if tester.get_last_tos(traces) == 30 and tester.get_last_sp(traces) == 1:
+    tos, sp, _ = tester.last_state(tester.run_bytecode(JR_REL))
+    if tos == 30 and sp == 1:
         print("PASS")
     else:
         print(f"FAIL")
 
     # 3. JZ (Jump if Zero) - Taken
     print("Test JZ (Taken)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 0, OP["JZ"], 0x07, 0x00, OP["PUSH8"], 99, OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 0:
+    if tester.get_last_tos(tester.run_bytecode(JZ_TAKEN)) == 0:
         print("PASS")
     else:
         print("FAIL")
 
     # 4. JZ (Jump if Zero) - Not Taken
     print("Test JZ (Not Taken)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 1, OP["JZ"], 0x07, 0x00, OP["PUSH8"], 99, OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 99:
+    if tester.get_last_tos(tester.run_bytecode(JZ_NOT_TAKEN)) == 99:
         print("PASS")
     else:
         print("FAIL")
 
     # 5. CALL / RET
-    # 0: CALL 5
-    # 3: HALT
-    # 4: NOP (padding)
-    # 5: PUSH8 42
-    # 7: RET
     print("Test CALL/RET...", end="", flush=True)
-    bytecode = [
-        OP["CALL"],
-        0x05,
-        0x00,
-        OP["HALT"],
-        OP["NOP"],
-        OP["PUSH8"],
-        42,
-        OP["RET"],
-    ]
-    traces = tester.run_bytecode(bytecode)
-    if tester.get_last_tos(traces) == 42:
+    tos, _, _ = tester.last_state(tester.run_bytecode(CALL_RET))
+    if tos == 42:
         print("PASS")
     else:
-        print(f"FAIL (tos={tester.get_last_tos(traces)})")
+        print(f"FAIL (tos={tos})")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
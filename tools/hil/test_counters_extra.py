@@ -1,13 +1,11 @@
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, h2i, ST_DIR
 import os
 import time
 
 
 def test_counters():
     tester = ZPLCTester()
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    st_file = os.path.join(script_dir, "st_tests", "counters_extra.st")
+    st_file = os.path.join(ST_DIR, "counters_extra.st")
 
     print("\n====================================================")
     print("          ZPLC Counters Extra (CTD, CTUD) TEST      ")
@@ -33,7 +31,7 @@ def test_counters():
     mem = tester.peek(0x2000, 64)
 
     def get_int(offset):
-        return struct.unpack("<h", bytearray(mem[offset : offset + 2]))[0]
+        return h2i(mem, offset)
 
     def get_bool(offset):
         return mem[offset] > 0
@@ -1,6 +1,6 @@
 import sys
 import time
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, u16
 
 
 def run_test():
@@ -16,7 +16,7 @@ def run_test():
     print("Peeking %Q0.0 (val)...")
     # Peek 2 bytes at 0x1000
     val_bytes = t.peek(0x1000, 2)
-    val = val_bytes[0] + (val_bytes[1] << 8) if len(val_bytes) >= 2 else -1
+    val = u16(val_bytes) if len(val_bytes) >= 2 else -1
     print(f"Val at 0x1000: {val} (Expected 50)")
 
     print("Peeking %Q2.0 (res_gt)...")
@@ -1,9 +1,10 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, Op, bc, push8
 
 
-def test_errors():
-    tester = ZPLCTester()
-    OP = tester.OP
+def test_errors(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     ERR = {
         "OK": 0,
@@ -17,9 +18,9 @@ def test_errors():
 
     # 1. DIV BY ZERO (Int)
     print("Test DIV by Zero (Int)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 10, OP["PUSH8"], 0, OP["DIV"], OP["HALT"]]
+    bytecode = bc(push8(10), push8(0), Op.DIV, Op.HALT)
     traces = tester.run_bytecode(bytecode)
-    err = next((t for t in traces if t.get("t") == "error"), {})
+    err = traces.first("error", {})
     if err.get("code") == ERR["DIV_BY_ZERO"]:
         print("PASS")
     else:
@@ -27,9 +28,9 @@ def test_errors():
 
     # 2. STACK UNDERFLOW
     print("Test Stack Underflow...", end="", flush=True)
-    bytecode = [OP["DROP"], OP["HALT"]]
+    bytecode = bc(Op.DROP, Op.HALT)
     traces = tester.run_bytecode(bytecode)
-    err = next((t for t in traces if t.get("t") == "error"), {})
+    err = traces.first("error", {})
     if err.get("code") == ERR["STACK_UNDERFLOW"]:
         print("PASS")
     else:
@@ -38,9 +39,9 @@ def test_errors():
 
     # 3. STACK OVERFLOW
     print("Test Stack Overflow...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 1] * 260 + [OP["HALT"]]
+    bytecode = bc(push8(1) * 260, Op.HALT)
     traces = tester.run_bytecode(bytecode)
-    err = next((t for t in traces if t.get("t") == "error"), {})
+    err = traces.first("error", {})
     if err.get("code") == ERR["STACK_OVERFLOW"]:
         print("PASS")
     else:
@@ -48,16 +49,17 @@ def test_errors():
 
     # 4. INVALID OPCODE
     print("Test Invalid Opcode...", end="", flush=True)
-    bytecode = [0xFE, OP["HALT"]]
+    bytecode = bc(0xFE, Op.HALT)
     traces = tester.run_bytecode(bytecode)
-    err = next((t for t in traces if t.get("t") == "error"), {})
+    err = traces.first("error", {})
     if err.get("code") == ERR["INVALID_OPCODE"]:
         print("PASS")
     else:
         print(f"FAIL (err={err.get('code')})")
         print(f"DEBUG: Traces: {traces}")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
@@ -23,22 +23,26 @@ def test_fb_ctu():
 
     print("Analyzing traces...")
 
-    for t in traces:
-        if t.get("t") == "opcode":
-            op = t.get("op")
-            tos = t.get("tos")
-
-            # Use LOAD16 to see what's being read from CV
-            # pc 77 in previous trace was LOAD16 0x2006 (CV)
-            if op == "LOAD16" and tos is not None:
-                if tos > last_cv and tos < 100:
-                    last_cv = tos
-
-            # Detect Q activation (STORE8 0x2003 or similar)
-            if (op.startswith("STORE") or op.startswith("LOAD")) and tos is not None:
-                val = tos & 0xFF
-                if val == 1 and last_cv >= 5:
-                    q_activated = True
+    # Solo interesan los traces de opcode (ya indexados por tipo al capturar)
+    for t in traces.by_type.get("opcode", []):
+        tos = t.get("tos")
+        if tos is None:
+            continue
+        op = t.get("op", "")
+
+        # Use LOAD16 to see what's being read from CV
+        # pc 77 in previous trace was LOAD16 0x2006 (CV)
+        if op == "LOAD16" and last_cv < tos < 100:
+            last_cv = tos
+
+        # Detect Q activation (STORE8 0x2003 or similar)
+        if (
+            not q_activated
+            and last_cv >= 5
+            and tos & 0xFF == 1
+            and op.startswith(("STORE", "LOAD"))
+        ):
+            q_activated = True
 
     print(f"Final Result -> Max CV: {last_cv}, Q Activated: {q_activated}")
 
@@ -1,5 +1,4 @@
 from zplc_tester import ZPLCTester
-import time
 
 
 def test_fb_rs():
@@ -20,71 +19,54 @@ def test_fb_rs():
     R_IN = 0x2005
     Q_OUT = 0x2006
 
+    # (descripcion, S, R1, ejecucion, Q1 esperado, detalle en caso de fallo)
+    # El primer paso corre en tiempo real para inicializar el programa; los
+    # siguientes ejecutan un ciclo confirmado por el firmware (sin sleeps).
+    STEPS = [
+        ("Step 1: Set (S=1, R1=0)", 1, 0, ("run", 0.5), 1, ""),
+        ("Step 2: Memory (S=0, R1=0)", 0, 0, ("ticks", 1), 1, ""),
+        ("Step 3: Reset (S=0, R1=1)", 0, 1, ("ticks", 1), 0, ""),
+        (
+            "Step 4: Dominance (S=1, R1=1)",
+            1,
+            1,
+            ("ticks", 1),
+            0,
+            ", expected 0 - R1 should be dominant",
+        ),
+    ]
+
     # Compile once
     bytecode = tester.compile_st(st_file)
     all_pass = True
 
-    # 1. SET: S=1, R1=0 -> Q1=1
-    print("Step 1: Set (S=1, R1=0)...", end="", flush=True)
     tester.reset_state()
-    time.sleep(0.5)  # Wait for reset
     tester.upload_bytecode(bytecode)
-    tester.send(f"zplc dbg poke {hex(S_IN)} 1")
-    tester.send(f"zplc dbg poke {hex(R_IN)} 0")
-    tester.start_and_wait(duration=0.5)  # Increased duration
-
-    q1 = tester.peek(Q_OUT, 1)[0]
-    if q1 == 1:
-        print("PASS ✅")
-    else:
-        print(f"FAIL ❌ (Q1={q1})")
-        all_pass = False
-
-    # 2. MEMORY: S=0, R1=0 -> Q1 stays 1
-    print("Step 2: Memory (S=0, R1=0)...", end="", flush=True)
-    tester.send("zplc stop")
-    tester.send(f"zplc dbg poke {hex(S_IN)} 0")
-    tester.send(f"zplc dbg poke {hex(R_IN)} 0")
-    tester.send("zplc start")
-    time.sleep(0.1)
-    tester.send("zplc stop")
-
-    q1 = tester.peek(Q_OUT, 1)[0]
-    if q1 == 1:
-        print("PASS ✅")
-    else:
-        print(f"FAIL ❌ (Q1={q1})")
-        all_pass = False
 
-    # 3. RESET: S=0, R1=1 -> Q1=0
-    print("Step 3: Reset (S=0, R1=1)...", end="", flush=True)
-    tester.send(f"zplc dbg poke {hex(S_IN)} 0")
-    tester.send(f"zplc dbg poke {hex(R_IN)} 1")
-    tester.send("zplc start")
-    time.sleep(0.1)
-    tester.send("zplc stop")
-
-    q1 = tester.peek(Q_OUT, 1)[0]
-    if q1 == 0:
-        print("PASS ✅")
-    else:
-        print(f"FAIL ❌ (Q1={q1})")
-        all_pass = False
-
-    # 4. DOMINANCE: S=1, R1=1 -> Q1=0 (Reset dominant)
-    print("Step 4: Dominance (S=1, R1=1)...", end="", flush=True)
-    tester.send(f"zplc dbg poke {hex(S_IN)} 1")
-    tester.send(f"zplc dbg poke {hex(R_IN)} 1")
-    tester.send("zplc start")
-    time.sleep(0.1)
-    tester.send("zplc stop")
-
-    q1 = tester.peek(Q_OUT, 1)[0]
-    if q1 == 0:
-        print("PASS ✅")
-    else:
-        print(f"FAIL ❌ (Q1={q1}, expected 0 - R1 should be dominant)")
-        all_pass = False
+    # Todos los pasos en un solo guion: sin esperas entre comandos
+    script = []
+    for _, s_in, r_in, execution, _, _ in STEPS:
+        script += [
+            ("poke", S_IN, s_in),
+            ("poke", R_IN, r_in),
+            execution,
+            ("peek", Q_OUT, 1),
+        ]
+    snapshots = tester.run_script(script)
+
+    for (desc, _, _, _, expected, hint), mem in zip(STEPS, snapshots):
+        print(f"{desc}...", end="", flush=True)
+        if not mem:
+            # run_script devuelve b"" si el ciclo no se confirmo
+            print("FAIL ❌ (no data: step not acknowledged or peek failed)")
+            all_pass = False
+            continue
+        q1 = mem[0]
+        if q1 == expected:
+            print("PASS ✅")
+        else:
+            print(f"FAIL ❌ (Q1={q1}{hint})")
+            all_pass = False
 
     tester.close()
 
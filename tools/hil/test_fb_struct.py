@@ -1,12 +1,5 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, h2i
 import time
-import struct
-
-
-def h2i(bytes_list):
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
 
 
 def test_fb_struct():
@@ -1,91 +1,110 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, Op, bc
 import struct
 
-
-def f2h(f):
-    """Float to hex (IEEE754 32-bit)"""
-    return struct.unpack("<I", struct.pack("<f", f))[0] & 0xFFFFFFFF
+_S_F = struct.Struct("<f")
+_S_I = struct.Struct("<I")
 
 
 def h2f(h):
     """Hex to float (IEEE754 32-bit)"""
     if h is None:
         return 0.0
-    return struct.unpack("<f", struct.pack("<I", h & 0xFFFFFFFF))[0]
+    return _S_F.unpack(_S_I.pack(h & 0xFFFFFFFF))[0]
+
+
+_PUSH32 = bytes((Op.PUSH32,))
+
+# Constantes REAL de los tests, empaquetadas una sola vez (operandos y
+# resultados esperados)
+PACKED_F = {
+    v: _S_F.pack(v) for v in (1.5, 2.5, 5.0, 2.0, 3.5, 10.0, 4.0, 7.0, 1.23, -1.23)
+}
+# Patron de bits IEEE754 de cada constante, para comparar contra el TOS
+F2H = {v: _S_I.unpack(packed)[0] for v, packed in PACKED_F.items()}
+
+
+def push_f(v):
+    """PUSH32 de un REAL ya empaquetado (IEEE754 little-endian)."""
+    return _PUSH32 + PACKED_F[v]
+
+
+def binop_f(a, b, op):
+    return bc(push_f(a), push_f(b), op, Op.HALT)
+
+
+def unop_f(a, op):
+    return bc(push_f(a), op, Op.HALT)
+
+
+# Programas construidos una sola vez al importar
+ADDF_PROG = binop_f(1.5, 2.5, Op.ADDF)
+SUBF_PROG = binop_f(5.0, 2.5, Op.SUBF)
+MULF_PROG = binop_f(2.0, 3.5, Op.MULF)
+DIVF_PROG = binop_f(10.0, 4.0, Op.DIVF)
+NEGF_VAL = 1.23
+NEGF_PROG = unop_f(NEGF_VAL, Op.NEGF)
+ABSF_VAL = -1.23
+ABSF_PROG = unop_f(ABSF_VAL, Op.ABSF)
 
 
-def test_float_math():
-    tester = ZPLCTester()
-    OP = tester.OP
+def test_float_math(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     print("\n--- Running Float Arithmetic Tests ---")
 
     # 1. ADDF: 1.5 + 2.5 = 4.0
     print("Test ADDF (1.5 + 2.5)...", end="", flush=True)
-    b1 = list(struct.pack("<f", 1.5))
-    b2 = list(struct.pack("<f", 2.5))
-    bytecode = [OP["PUSH32"]] + b1 + [OP["PUSH32"]] + b2 + [OP["ADDF"], OP["HALT"]]
-    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
-    if tos == f2h(4.0):
+    tos = tester.get_last_tos(tester.run_bytecode(ADDF_PROG))
+    if tos == F2H[4.0]:
         print("PASS")
     else:
         print(f"FAIL (tos={h2f(tos) if tos else None})")
 
     # 2. SUBF: 5.0 - 2.5 = 2.5
     print("Test SUBF (5.0 - 2.5)...", end="", flush=True)
-    b1 = list(struct.pack("<f", 5.0))
-    b2 = list(struct.pack("<f", 2.5))
-    bytecode = [OP["PUSH32"]] + b1 + [OP["PUSH32"]] + b2 + [OP["SUBF"], OP["HALT"]]
-    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
-    if tos == f2h(2.5):
+    tos = tester.get_last_tos(tester.run_bytecode(SUBF_PROG))
+    if tos == F2H[2.5]:
         print("PASS")
     else:
         print(f"FAIL")
 
     # 3. MULF: 2.0 * 3.5 = 7.0
     print("Test MULF (2.0 * 3.5)...", end="", flush=True)
-    b1 = list(struct.pack("<f", 2.0))
-    b2 = list(struct.pack("<f", 3.5))
-    bytecode = [OP["PUSH32"]] + b1 + [OP["PUSH32"]] + b2 + [OP["MULF"], OP["HALT"]]
-    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
-    if tos == f2h(7.0):
+    tos = tester.get_last_tos(tester.run_bytecode(MULF_PROG))
+    if tos == F2H[7.0]:
         print("PASS")
     else:
         print(f"FAIL")
 
     # 4. DIVF: 10.0 / 4.0 = 2.5
     print("Test DIVF (10.0 / 4.0)...", end="", flush=True)
-    b1 = list(struct.pack("<f", 10.0))
-    b2 = list(struct.pack("<f", 4.0))
-    bytecode = [OP["PUSH32"]] + b1 + [OP["PUSH32"]] + b2 + [OP["DIVF"], OP["HALT"]]
-    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
-    if tos == f2h(2.5):
+    tos = tester.get_last_tos(tester.run_bytecode(DIVF_PROG))
+    if tos == F2H[2.5]:
         print("PASS")
     else:
         print(f"FAIL")
 
     # 5. NEGF: 1.23 -> -1.23
     print("Test NEGF (1.23 -> -1.23)...", end="", flush=True)
-    val = 1.23
-    bytecode = [OP["PUSH32"]] + list(struct.pack("<f", val)) + [OP["NEGF"], OP["HALT"]]
-    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
+    tos = tester.get_last_tos(tester.run_bytecode(NEGF_PROG))
     # Usamos round para evitar problemas de precisión float
-    if round(h2f(tos), 5) == round(-val, 5):
+    if round(h2f(tos), 5) == round(-NEGF_VAL, 5):
         print("PASS")
     else:
         print(f"FAIL (tos={h2f(tos)})")
 
     # 6. ABSF: -1.23 -> 1.23
     print("Test ABSF (-1.23 -> 1.23)...", end="", flush=True)
-    val = -1.23
-    bytecode = [OP["PUSH32"]] + list(struct.pack("<f", val)) + [OP["ABSF"], OP["HALT"]]
-    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
-    if round(h2f(tos), 5) == round(abs(val), 5):
+    tos = tester.get_last_tos(tester.run_bytecode(ABSF_PROG))
+    if round(h2f(tos), 5) == round(abs(ABSF_VAL), 5):
         print("PASS")
     else:
         print(f"FAIL")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
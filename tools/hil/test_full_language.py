@@ -1,12 +1,17 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, ST_DIR
 import struct
 import os
 
+# Result block in WORK memory (offsets relative to 0x2000):
+#   0x16C currentState (INT), 0x178 calc_res1 (REAL), 0x17C calc_res2 (REAL),
+#   0x182..0x185 flag_enum, flag_oop, flag_temp, flag_types (BOOL)
+RESULTS_OFFSET = 0x16C
+RESULTS = struct.Struct("<h10xff2x4B")
+
 
 def test_full():
     tester = ZPLCTester()
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    st_file = os.path.join(script_dir, "st_tests", "full_language_test.st")
+    st_file = os.path.join(ST_DIR, "full_language_test.st")
 
     print("\n====================================================")
     print("          ZPLC Full Language HIL TEST               ")
@@ -22,27 +27,17 @@ def test_full():
     print("Running for 3.0 seconds...")
     tester.start_and_wait(duration=3.0)
 
-    # Read block from 0x2000
-    mem = tester.peek(0x2000, 512)
-
-    def get_bool(offset):
-        return mem[offset] > 0
-
-    def get_real(offset):
-        return struct.unpack("<f", bytearray(mem[offset : offset + 4]))[0]
-
-    def get_int(offset):
-        return struct.unpack("<h", bytearray(mem[offset : offset + 2]))[0]
-
-    # Offsets relative to 0x2000
-    currentState = get_int(0x16C)
-    calc_res1 = get_real(0x178)
-    calc_res2 = get_real(0x17C)
-
-    flag_enum = get_bool(0x182)
-    flag_oop = get_bool(0x183)
-    flag_temp = get_bool(0x184)
-    flag_types = get_bool(0x185)
+    # Read only the result block instead of 512 bytes from 0x2000
+    mem = tester.peek(0x2000 + RESULTS_OFFSET, RESULTS.size)
+    (
+        currentState,
+        calc_res1,
+        calc_res2,
+        flag_enum,
+        flag_oop,
+        flag_temp,
+        flag_types,
+    ) = RESULTS.unpack_from(mem)
 
     print(f"CurrentState: {currentState} (Expected: 2)")
     print(f"Calc Res1: {calc_res1} (Expected: 20.0)")
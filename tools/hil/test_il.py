@@ -1,6 +1,9 @@
 from zplc_tester import ZPLCTester
 import struct
 
+# a, b, res (INT) y flag (BOOL) consecutivos desde 0x1000
+_IL = struct.Struct("<hhhB")
+
 
 def test_il():
     tester = ZPLCTester()
@@ -29,16 +32,13 @@ def test_il():
     tester.start_and_wait(duration=0.5)
 
     print("Peeking memory...")
-    mem = tester.peek(0x1000, 7)
+    mem = tester.peek(0x1000, _IL.size)
 
-    if len(mem) < 7:
+    if len(mem) < _IL.size:
         print("FAIL: Incomplete read")
         return
 
-    val_a = struct.unpack("<h", bytearray(mem[0:2]))[0]
-    val_b = struct.unpack("<h", bytearray(mem[2:4]))[0]
-    val_res = struct.unpack("<h", bytearray(mem[4:6]))[0]
-    val_flag = mem[6]
+    val_a, val_b, val_res, val_flag = _IL.unpack_from(mem)
 
     print(f"a: {val_a} (Exp: 10)")
     print(f"b: {val_b} (Exp: 20)")
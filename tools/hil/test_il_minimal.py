@@ -14,7 +14,7 @@ def test_il_minimal():
     tester.start_and_wait(duration=0.5)
 
     mem = tester.peek(0x1000, 2)
-    val = struct.unpack("<h", bytearray(mem))[0]
+    val = struct.unpack_from("<h", mem)[0]
 
     print(f"res: {val} (Exp: 123)")
 
@@ -1,93 +1,82 @@
 import sys
 import os
-from language_tester import LanguageTester
-
-
-def run_tests():
-    tester = LanguageTester()
-    results = []
-
-    print("\n--- TEST: IL Arithmetic ---")
-    try:
-        tester.compile_and_run("tools/hil/il_tests/arithmetic.il", duration=1.0)
-        # Check a=10 (0), b=5 (2)
-        # res_add (4) = 15
-        # res_sub (6) = 5
-        # res_mul (8) = 50
-        # res_div (10) = 2
-        # res_mod (12) = 0
-
-        r1 = tester.expect_int16(0, 10, "a")
-        r2 = tester.expect_int16(2, 5, "b")
-        r3 = tester.expect_int16(4, 15, "res_add")
-        r4 = tester.expect_int16(6, 5, "res_sub")
-        r5 = tester.expect_int16(8, 50, "res_mul")
-        r6 = tester.expect_int16(10, 2, "res_div")
-        r7 = tester.expect_int16(12, 0, "res_mod")
-
-        results.append(all([r1, r2, r3, r4, r5, r6, r7]))
-    except Exception as e:
-        print(f"FAILED: {e}")
-        import traceback
-
-        traceback.print_exc()
-        results.append(False)
-
-    print("\n--- TEST: IL Comparison ---")
-    try:
-        tester.compile_and_run("tools/hil/il_tests/comparison.il", duration=1.0)
-        # val=50 at %Q0 (bytes 0-1)
-
-        # is_gt at %Q2.0 -> Byte 2, Bit 0
-        r1 = tester.expect_bool(2, 0, True, "is_gt (50 > 40)")
-        # is_lt at %Q3.0 -> Byte 3, Bit 0
-        r2 = tester.expect_bool(3, 0, True, "is_lt (50 < 60)")
-        # is_eq at %Q4.0 -> Byte 4, Bit 0
-        r3 = tester.expect_bool(4, 0, True, "is_eq (50 == 50)")
-        # is_ne at %Q5.0 -> Byte 5, Bit 0
-        r4 = tester.expect_bool(5, 0, True, "is_ne (50 != 99)")
-
-        results.append(all([r1, r2, r3, r4]))
-    except Exception as e:
-        print(f"FAILED: {e}")
-        results.append(False)
-
-    print("\n--- TEST: IL Logic ---")
-    try:
-        tester.compile_and_run("tools/hil/il_tests/logic.il", duration=1.0)
-        # t=1 (0), f=0 (1)
-        # and=0 (2), or=1 (3), xor=1 (4), not=0 (5)
-
-        r1 = tester.expect_bool(2, 0, False, "res_and")
-        r2 = tester.expect_bool(3, 0, True, "res_or")
-        r3 = tester.expect_bool(4, 0, True, "res_xor")
-        r4 = tester.expect_bool(5, 0, False, "res_not")  # NOT t -> NOT TRUE -> FALSE
-
-        results.append(all([r1, r2, r3, r4]))
-    except Exception as e:
-        print(f"FAILED: {e}")
-        results.append(False)
-
-    print("\n--- TEST: IL Jumps ---")
-    try:
-        tester.compile_and_run("tools/hil/il_tests/jumps.il", duration=1.0)
-        # skip1_result (0) = 0 (skipped by JMPC when jump_cond=TRUE)
-        # skip2_result (2) = 0 (always skipped by JMP)
-        # exec1_result (4) = 42 (always executed)
-        # exec2_result (6) = 77 (always executed)
-
-        r1 = tester.expect_int16(0, 0, "skip1_result (JMPC skipped)")
-        r2 = tester.expect_int16(2, 0, "skip2_result (JMP skipped)")
-        r3 = tester.expect_int16(4, 42, "exec1_result (after JMPC)")
-        r4 = tester.expect_int16(6, 77, "exec2_result (after JMP)")
-
-        results.append(all([r1, r2, r3, r4]))
-    except Exception as e:
-        print(f"FAILED: {e}")
-        results.append(False)
-
-    tester.close()
-    return all(results)
+from language_tester import run_cases
+
+
+def check_arithmetic(tester):
+    # Check a=10 (0), b=5 (2)
+    # res_add (4) = 15
+    # res_sub (6) = 5
+    # res_mul (8) = 50
+    # res_div (10) = 2
+    # res_mod (12) = 0
+    return tester.batch_expect(
+        [
+            ("int16", 0, 10, "a"),
+            ("int16", 2, 5, "b"),
+            ("int16", 4, 15, "res_add"),
+            ("int16", 6, 5, "res_sub"),
+            ("int16", 8, 50, "res_mul"),
+            ("int16", 10, 2, "res_div"),
+            ("int16", 12, 0, "res_mod"),
+        ]
+    )
+
+
+def check_comparison(tester):
+    # val=50 at %Q0 (bytes 0-1)
+
+    # is_gt .. is_ne at %Q2.0 .. %Q5.0 -> Bytes 2-5, Bit 0
+    return tester.batch_expect(
+        [
+            ("bool", 2, True, "is_gt (50 > 40)"),
+            ("bool", 3, True, "is_lt (50 < 60)"),
+            ("bool", 4, True, "is_eq (50 == 50)"),
+            ("bool", 5, True, "is_ne (50 != 99)"),
+        ]
+    )
+
+
+def check_logic(tester):
+    # t=1 (0), f=0 (1)
+    # and=0 (2), or=1 (3), xor=1 (4), not=0 (5)
+
+    return tester.batch_expect(
+        [
+            ("bool", 2, False, "res_and"),
+            ("bool", 3, True, "res_or"),
+            ("bool", 4, True, "res_xor"),
+            ("bool", 5, False, "res_not"),  # NOT t -> NOT TRUE -> FALSE
+        ]
+    )
+
+
+def check_jumps(tester):
+    # skip1_result (0) = 0 (skipped by JMPC when jump_cond=TRUE)
+    # skip2_result (2) = 0 (always skipped by JMP)
+    # exec1_result (4) = 42 (always executed)
+    # exec2_result (6) = 77 (always executed)
+    return tester.batch_expect(
+        [
+            ("int16", 0, 0, "skip1_result (JMPC skipped)"),
+            ("int16", 2, 0, "skip2_result (JMP skipped)"),
+            ("int16", 4, 42, "exec1_result (after JMPC)"),
+            ("int16", 6, 77, "exec2_result (after JMP)"),
+        ]
+    )
+
+
+# (titulo, fuente, duracion, verificacion)
+CASES = [
+    ("IL Arithmetic", "tools/hil/il_tests/arithmetic.il", 1.0, check_arithmetic),
+    ("IL Comparison", "tools/hil/il_tests/comparison.il", 1.0, check_comparison),
+    ("IL Logic", "tools/hil/il_tests/logic.il", 1.0, check_logic),
+    ("IL Jumps", "tools/hil/il_tests/jumps.il", 1.0, check_jumps),
+]
+
+
+def run_tests(tester=None):
+    return all(run_cases(CASES, tester))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,10 @@
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, Op, bc, push8, push16, push32, op_addr
 
 
-def test_load_store():
-    tester = ZPLCTester()
-    OP = tester.OP
+def test_load_store(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     # Memoria WORK empieza en 0x2000
     WORK_ADDR = 0x2000
@@ -14,17 +14,12 @@ def test_load_store():
 
     # 1. STORE8 / LOAD8
     print("Test STORE8/LOAD8...", end="", flush=True)
-    bytecode = [
-        OP["PUSH8"],
-        42,
-        OP["STORE8"],
-        0x00,
-        0x20,  # Store 42 at 0x2000
-        OP["LOAD8"],
-        0x00,
-        0x20,  # Load from 0x2000
-        OP["HALT"],
-    ]
+    bytecode = bc(
+        push8(42),
+        op_addr(Op.STORE8, WORK_ADDR),  # Store 42 at 0x2000
+        op_addr(Op.LOAD8, WORK_ADDR),  # Load from 0x2000
+        Op.HALT,
+    )
     if tester.get_last_tos(tester.run_bytecode(bytecode)) == 42:
         print("PASS")
     else:
@@ -33,18 +28,11 @@ def test_load_store():
     # 2. STORE32 / LOAD32
     print("Test STORE32/LOAD32...", end="", flush=True)
     val = 0x12345678
-    bytecode = (
-        [OP["PUSH32"]]
-        + list(struct.pack("<I", val))
-        + [
-            OP["STORE32"],
-            0x10,
-            0x20,  # Store at 0x2010
-            OP["LOAD32"],
-            0x10,
-            0x20,  # Load from 0x2010
-            OP["HALT"],
-        ]
+    bytecode = bc(
+        push32(val),
+        op_addr(Op.STORE32, WORK_ADDR + 0x10),  # Store at 0x2010
+        op_addr(Op.LOAD32, WORK_ADDR + 0x10),  # Load from 0x2010
+        Op.HALT,
     )
     if tester.get_last_tos(tester.run_bytecode(bytecode)) == val:
         print("PASS")
@@ -54,19 +42,14 @@ def test_load_store():
     # 3. STOREI32 / LOADI32 (Indirect)
     print("Test Indirect access...", end="", flush=True)
     # [addr val STOREI32]
-    bytecode = [
-        OP["PUSH16"],
-        0x20,
-        0x20,  # Addr 0x2020
-        OP["PUSH8"],
-        99,
-        OP["STOREI32"],
-        OP["PUSH16"],
-        0x20,
-        0x20,
-        OP["LOADI32"],
-        OP["HALT"],
-    ]
+    bytecode = bc(
+        push16(WORK_ADDR + 0x20),  # Addr 0x2020
+        push8(99),
+        Op.STOREI32,
+        push16(WORK_ADDR + 0x20),
+        Op.LOADI32,
+        Op.HALT,
+    )
     if tester.get_last_tos(tester.run_bytecode(bytecode)) == 99:
         print("PASS")
     else:
@@ -75,23 +58,19 @@ def test_load_store():
     # 4. OPI Write
     print("Test OPI Write...", end="", flush=True)
     # PUSH8 0xAA, STORE8 0x1000, LOAD8 0x1000, HALT
-    bytecode = [
-        OP["PUSH8"],
-        0xAA,
-        OP["STORE8"],
-        0x00,
-        0x10,
-        OP["LOAD8"],
-        0x00,
-        0x10,
-        OP["HALT"],
-    ]
+    bytecode = bc(
+        push8(0xAA),
+        op_addr(Op.STORE8, OPI_ADDR),
+        op_addr(Op.LOAD8, OPI_ADDR),
+        Op.HALT,
+    )
     if tester.get_last_tos(tester.run_bytecode(bytecode)) == 0xAA:
         print("PASS")
     else:
         print("FAIL")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
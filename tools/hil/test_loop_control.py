@@ -1,12 +1,5 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, h2i
 import time
-import struct
-
-
-def h2i(bytes_list):
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
 
 
 def test_loop_control():
@@ -41,8 +34,8 @@ def test_loop_control():
 
     # res_exit @ 0x1000 (2 bytes)
     # res_cont @ 0x1002 (2 bytes) (offset 2 in data)
-    res_exit = h2i(opi_data[0:2])
-    res_cont = h2i(opi_data[4:6])  # Wait, offset for %Q2.0 is 0x1002 ? NO.
+    res_exit = h2i(opi_data)
+    res_cont = h2i(opi_data, 4)  # Wait, offset for %Q2.0 is 0x1002 ? NO.
 
     # %Q0.0 -> Byte 0 (0x1000)
     # %Q2.0 -> Byte 2 (0x1002)
@@ -52,7 +45,7 @@ def test_loop_control():
     # opi_data[2]: 0x1002
     # opi_data[3]: 0x1003
 
-    res_cont_real = h2i(opi_data[2:4])
+    res_cont_real = h2i(opi_data, 2)
 
     print("\n--- RESULTS ---")
     print(
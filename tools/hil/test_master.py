@@ -1,4 +1,5 @@
 from zplc_tester import ZPLCTester
+import os
 import time
 
 
@@ -16,17 +17,19 @@ def test_master():
     bytecode = tester.compile_st(st_file)
     tester.upload_bytecode(bytecode)
 
-    # 2. Correr por 10 segundos (100 ciclos)
+    # 2. Correr hasta que el programa marque res_done (%Q0.4), max 10 segundos
     # Sin verbose para no saturar el serial
-    print("Running master test sequence for 10 seconds...")
-    tester.start_and_wait(duration=10.0)
+    print("Running master test sequence (up to 10 seconds)...")
+    if not tester.start_and_wait_flag(0x1004, timeout=10.0):
+        print("WARN: res_done not set before timeout")
 
     # 3. Leer resultados de OPI
     # res_rs @ 0x1000, res_sr @ 0x1001, res_trig @ 0x1002, res_ctu @ 0x1003
     print("Peeking results from OPI...")
-    # Debug: ver respuesta cruda del peek
-    raw_resp = tester.send(f"zplc dbg peek 0x1000 4")
-    print(f"DEBUG: Raw Peek Response: {raw_resp}")
+    # Debug: ver respuesta cruda del peek (lectura extra, solo con ZPLC_DEBUG)
+    if os.environ.get("ZPLC_DEBUG"):
+        raw_resp = tester.send("zplc dbg peek 0x1000 4")
+        print(f"DEBUG: Raw Peek Response: {raw_resp}")
 
     opi_data = tester.peek(0x1000, 4)
 
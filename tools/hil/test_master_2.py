@@ -1,13 +1,5 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, h2i
 import time
-import struct
-
-
-def h2i(bytes_list):
-    """Convierte 2 bytes (list) a int 16-bit signed."""
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
 
 
 def test_master_2():
@@ -24,18 +16,21 @@ def test_master_2():
     bytecode = tester.compile_st(st_file)
     tester.upload_bytecode(bytecode)
 
-    # 2. Correr por 12 segundos (para estar seguros de los 100ms * 100)
-    print("Running master test sequence for 12 seconds...")
-    tester.start_and_wait(duration=12.0)
+    # 2. Correr hasta que el programa marque res_done (%Q0.0), max 12 segundos
+    print("Running master test sequence (up to 12 seconds)...")
+    if not tester.start_and_wait_flag(0x1000, timeout=12.0):
+        print("WARN: res_done not set before timeout")
 
     # 3. Leer resultados de WORK
     # res_tof @ 8234, res_tp @ 8235, res_for @ 8236 (2b), res_case @ 8238 (2b)
     print("Peeking results from WORK memory...")
 
-    cycle_count = tester.peek(8192, 2)
+    # Un solo peek de 8192..8239 (ciclos + resultados) en vez de dos
+    blob = tester.peek(8192, 8234 - 8192 + 6)
+    cycle_count = blob[0:2]
     print(f"DEBUG: PLC Cycles: {h2i(cycle_count)}")
 
-    res_data = tester.peek(8234, 6)
+    res_data = memoryview(blob)[8234 - 8192 :]
     if len(res_data) < 6:
         print(f"ERROR: Incomplete data read ({len(res_data)} bytes)")
         tester.close()
@@ -44,8 +39,8 @@ def test_master_2():
     results = {
         "TOF (Off Delay)": res_data[0] == 1,
         "TP (Pulse)": res_data[1] == 1,
-        "FOR Loop (1..5)": h2i(res_data[2:4]) == 15,
-        "CASE Statement": h2i(res_data[4:6]) == 200,
+        "FOR Loop (1..5)": h2i(res_data, 2) == 15,
+        "CASE Statement": h2i(res_data, 4) == 200,
     }
 
     print("\n--- TEST REPORT ---")
@@ -53,9 +48,9 @@ def test_master_2():
     for test, passed in results.items():
         val = ""
         if "FOR" in test:
-            val = f" (Val: {h2i(res_data[2:4])})"
+            val = f" (Val: {h2i(res_data, 2)})"
         if "CASE" in test:
-            val = f" (Val: {h2i(res_data[4:6])})"
+            val = f" (Val: {h2i(res_data, 4)})"
 
         status = "PASS ✅" if passed else "FAIL ❌"
         if not passed:
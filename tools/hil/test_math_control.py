@@ -1,20 +1,8 @@
 from zplc_tester import ZPLCTester
-import struct
-import time
 
-
-def h2f(bytes_list):
-    """Convierte 4 bytes (list) a float 32-bit (IEEE754)."""
-    if len(bytes_list) < 4:
-        return 0.0
-    return struct.unpack("<f", bytearray(bytes_list))[0]
-
-
-def h2i(bytes_list):
-    """Convierte 2 bytes (list) a int 16-bit signed."""
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
+# res_sqrt, res_ln, res_sin (REAL) + res_expt, res_for, res_case (INT)
+RESULTS_FMT = "<fffhhh"
+RESULTS_NAMES = ("sqrt", "ln", "sin", "expt", "for_", "case_")
 
 
 def test_math_control():
@@ -44,20 +32,17 @@ def test_math_control():
     # res_case @ 0x1014 (2 bytes)
 
     print("Peeking OPI memory...")
-    data = tester.peek(0x1004, 18)  # Leemos un bloque desde 0x1004
+    # Leemos un bloque desde 0x1004
+    vals = tester.peek_struct(0x1004, RESULTS_FMT, RESULTS_NAMES)
 
-    if len(data) < 18:
+    if vals is None:
         print("ERROR: Incomplete data read")
         tester.close()
         return
 
     # Extraer valores
-    sqrt_val = h2f(data[0:4])
-    ln_val = h2f(data[4:8])
-    sin_val = h2f(data[8:12])
-    expt_val = h2i(data[12:14])
-    for_val = h2i(data[14:16])
-    case_val = h2i(data[16:18])
+    sqrt_val, ln_val, sin_val = vals["sqrt"], vals["ln"], vals["sin"]
+    expt_val, for_val, case_val = vals["expt"], vals["for_"], vals["case_"]
 
     print("\n--- MATH RESULTS ---")
     print(
@@ -1,19 +1,5 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, h2i, h2f
 import time
-import struct
-
-
-def h2f(bytes_list):
-    """Convierte 4 bytes a float 32-bit."""
-    if len(bytes_list) < 4:
-        return 0.0
-    return struct.unpack("<f", bytearray(bytes_list))[0]
-
-
-def h2i(bytes_list):
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
 
 
 def test_math_real():
@@ -51,8 +37,8 @@ def test_math_real():
         tester.close()
         return
 
-    res_ok = h2i(opi_data[0:2])
-    sin_val = h2f(opi_data[4:8])
+    res_ok = h2i(opi_data)
+    sin_val = h2f(opi_data, 4)
 
     print("\n--- RESULTS ---")
     print(f"SIN(PI/2) Value : {sin_val:.6f} (Target: 1.0)")
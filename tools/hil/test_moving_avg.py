@@ -1,12 +1,6 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, h2i
+import sys
 import time
-import struct
-
-
-def h2i(bytes_list):
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
 
 
 def test_moving_avg():
@@ -35,29 +29,31 @@ def test_moving_avg():
     tester.send("zplc start")
 
     # Muestrear cada 200ms durante 3 segundos
-    print("Time(s) | Avg Output")
-    print("--------|-----------")
-
-    start_time = time.time()
-    last_val = -1
-    stable_count = 0
-    increasing_count = 0
-
-    while time.time() - start_time < 3.0:
+    # Muestras en una grilla fija (start + k*0.2s): el tiempo del peek no
+    # acumula deriva entre muestras
+    period = 0.2
+    start_time = time.monotonic()
+    # La tabla se imprime al final: nada de print dentro del muestreo
+    rows = []
+
+    for k in range(round(3.0 / period)):
+        time.sleep(max(0.0, start_time + k * period - time.monotonic()))
         data = tester.peek(0x1000, 2)
         if len(data) >= 2:
             val = h2i(data)
-            print(f"{(time.time() - start_time):.2f}    | {val}")
-
-            if val > last_val and last_val != -1:
-                increasing_count += 1
-            if val > 0:
-                stable_count += 1
-            last_val = val
-        time.sleep(0.2)
+            rows.append((time.monotonic() - start_time, val))
 
     tester.send("zplc stop")
 
+    print("Time(s) | Avg Output")
+    print("--------|-----------")
+    sys.stdout.write("".join(f"{t:.2f}    | {v}\n" for t, v in rows))
+
+    # Metricas de tendencia sobre la serie completa
+    samples = [v for _, v in rows]
+    stable_count = sum(v > 0 for v in samples)
+    increasing_count = sum(b > a for a, b in zip(samples, samples[1:]))
+
     print("\n--- RESULTS ---")
     print(f"Samples > 0: {stable_count}")
     print(f"Increasing Trend: {increasing_count}")
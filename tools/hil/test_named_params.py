@@ -1,12 +1,11 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, ST_DIR
 import struct
 import os
 
 
 def test_named():
     tester = ZPLCTester()
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    st_file = os.path.join(script_dir, "st_tests", "named_params_test.st")
+    st_file = os.path.join(ST_DIR, "named_params_test.st")
 
     print("\n====================================================")
     print("          ZPLC Named Params HIL TEST (REAL)         ")
@@ -18,8 +18,7 @@ Work memory:
 - 0x2002: myCounter.MaxVal INT
 """
 
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, h2i, ST_DIR
 import os
 
 
@@ -31,8 +30,7 @@ def test_oop():
     print("====================================================")
 
     # Get the directory where this script lives
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    st_file = os.path.join(script_dir, "st_tests", "oop_test.st")
+    st_file = os.path.join(ST_DIR, "oop_test.st")
 
     print("Compiling and uploading...")
     try:
@@ -50,35 +48,14 @@ def test_oop():
 
     print("Peeking memory...")
 
-    # Read test_passed (BOOL at 0x1000)
-    test_passed_data = tester.peek(0x1000, 1)
-    test_passed = test_passed_data[0] if test_passed_data else 0
-
-    # Read counter_value (INT at 0x1002)
-    counter_data = tester.peek(0x1002, 2)
-    counter_value = (
-        struct.unpack("<h", bytearray(counter_data))[0] if len(counter_data) >= 2 else 0
-    )
-
-    # Read method_result (INT at 0x1004)
-    method_data = tester.peek(0x1004, 2)
-    method_result = (
-        struct.unpack("<h", bytearray(method_data))[0] if len(method_data) >= 2 else 0
-    )
-
-    # Read cycle_count (INT at 0x1006)
-    cycle_data = tester.peek(0x1006, 2)
-    cycle_count = (
-        struct.unpack("<h", bytearray(cycle_data))[0] if len(cycle_data) >= 2 else 0
-    )
-
-    # Also peek at myCounter.Count in work memory (0x2000)
-    fb_count_data = tester.peek(0x2000, 2)
-    fb_count = (
-        struct.unpack("<h", bytearray(fb_count_data))[0]
-        if len(fb_count_data) >= 2
-        else 0
-    )
+    # OPI 0x1000..0x1007 (test_passed BOOL, counter_value, method_result,
+    # cycle_count INT) and myCounter.Count (WORK 0x2000) in one mpeek
+    opi, fb_count_data = tester.mpeek([(0x1000, 8), (0x2000, 2)])
+    test_passed = opi[0] if opi else 0
+    counter_value = h2i(opi, 2)
+    method_result = h2i(opi, 4)
+    cycle_count = h2i(opi, 6)
+    fb_count = h2i(fb_count_data)
 
     print("\n--- RESULTS ---")
     print(f"PLC Cycles:      {cycle_count}")
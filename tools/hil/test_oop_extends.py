@@ -7,8 +7,7 @@ Tests IEC 61131-3 EXTENDS:
 - Method override (child replaces base method)
 """
 
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, h2i, ST_DIR
 import os
 
 
@@ -20,8 +19,7 @@ def test_oop_extends():
     print("====================================================")
 
     # Get the directory where this script lives
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    st_file = os.path.join(script_dir, "st_tests", "oop_extends_simple.st")
+    st_file = os.path.join(ST_DIR, "oop_extends_simple.st")
 
     print("Compiling and uploading...")
     try:
@@ -46,9 +44,7 @@ def test_oop_extends():
 
     # Read debug (INT at 0x1000)
     debug_data = tester.peek(0x1000, 2)
-    debug_val = (
-        struct.unpack("<h", bytearray(debug_data))[0] if len(debug_data) >= 2 else 0
-    )
+    debug_val = h2i(debug_data)
 
     print("\n--- RESULTS ---")
     print(f"debug_val:       {debug_val} (Expected: 222)")
@@ -62,8 +58,6 @@ def test_oop_extends():
         print("PASS ✅")
 
     print("\n" + "=" * 52)
-    tester.close()
-    return all_pass
     if all_pass:
         print("RESULT: OOP EXTENDS TEST PASSED! ✅🎉")
     else:
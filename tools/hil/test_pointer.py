@@ -1,12 +1,5 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, h2i
 import time
-import struct
-
-
-def h2i(bytes_list):
-    if len(bytes_list) < 2:
-        return 0
-    return struct.unpack("<h", bytearray(bytes_list))[0]
 
 
 def test_pointer():
@@ -39,8 +32,8 @@ def test_pointer():
         tester.close()
         return
 
-    res_read = h2i(opi_data[0:2])
-    res_write = h2i(opi_data[2:4])
+    res_read = h2i(opi_data)
+    res_write = h2i(opi_data, 2)
 
     print("\n--- RESULTS ---")
     print(
@@ -1,12 +1,15 @@
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, ST_DIR
 import os
 
+# Campos leidos desde 0x2000: hyst_q @0x14 (BOOL), db_out @0x2C, lag_out @0x44,
+# ramp_out @0x5C, pid_out @0x98 (REAL), cycle @0x9C (INT)
+RESULTS_FMT = "<20xB23xf20xf20xf56xfh"
+RESULTS_NAMES = ("hyst_q", "db_out", "lag_out", "ramp_out", "pid_out", "cycle")
+
 
 def test_process():
     tester = ZPLCTester()
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    st_file = os.path.join(script_dir, "st_tests", "process_test.st")
+    st_file = os.path.join(ST_DIR, "process_test.st")
 
     print("\n====================================================")
     print("          ZPLC Process Control HIL TEST             ")
@@ -23,23 +26,18 @@ def test_process():
     tester.start_and_wait(duration=2.0)
 
     # Read block from 0x2000
-    mem = tester.peek(0x2000, 256)
-
-    def get_bool(offset):
-        return mem[offset] > 0
-
-    def get_real(offset):
-        return struct.unpack("<f", bytearray(mem[offset : offset + 4]))[0]
-
-    def get_int(offset):
-        return struct.unpack("<h", bytearray(mem[offset : offset + 2]))[0]
+    vals = tester.peek_struct(0x2000, RESULTS_FMT, RESULTS_NAMES)
+    if vals is None:
+        print("ERROR: Incomplete data read")
+        tester.close()
+        return False
 
-    hyst_q = get_bool(0x14)
-    db_out = get_real(0x2C)
-    lag_out = get_real(0x44)
-    ramp_out = get_real(0x5C)
-    pid_out = get_real(0x98)
-    cycle = get_int(0x9C)
+    hyst_q = vals["hyst_q"] > 0
+    db_out = vals["db_out"]
+    lag_out = vals["lag_out"]
+    ramp_out = vals["ramp_out"]
+    pid_out = vals["pid_out"]
+    cycle = vals["cycle"]
 
     print(f"Cycles executed: {cycle}")
     print(f"HYSTERESIS Q: {hyst_q}")
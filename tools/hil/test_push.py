@@ -1,24 +1,25 @@
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, Op, bc, push8, push16, push32
 
 
-def test_push():
-    tester = ZPLCTester()
-    OP = tester.OP
+def test_push(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     print("\n--- Running Push Variant Tests ---")
 
     # 1. PUSH8 (Signed 127)
     print("Test PUSH8 (127)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 127, OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 127:
+    bytecode = bc(push8(127), Op.HALT)
+    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
+    if tos == 127:
         print("PASS")
     else:
-        print("FAIL")
+        print(f"FAIL (tos={tos})")
 
     # 2. PUSH8 (Signed -128)
     print("Test PUSH8 (-128)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 0x80, OP["HALT"]]
+    bytecode = bc(push8(-128), Op.HALT)
     tos = tester.get_last_tos(tester.run_bytecode(bytecode))
     if tos == 4294967168 or tos == -128:
         print("PASS")
@@ -27,17 +28,16 @@ def test_push():
 
     # 3. PUSH16 (Signed 32767)
     print("Test PUSH16 (32767)...", end="", flush=True)
-    # Little-endian: 0xFF 0x7F
-    bytecode = [OP["PUSH16"], 0xFF, 0x7F, OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == 32767:
+    bytecode = bc(push16(32767), Op.HALT)
+    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
+    if tos == 32767:
         print("PASS")
     else:
-        print(f"FAIL (tos={tester.get_last_tos(tester.run_bytecode(bytecode))})")
+        print(f"FAIL (tos={tos})")
 
     # 4. PUSH16 (Signed -32768)
     print("Test PUSH16 (-32768)...", end="", flush=True)
-    # Little-endian: 0x00 0x80
-    bytecode = [OP["PUSH16"], 0x00, 0x80, OP["HALT"]]
+    bytecode = bc(push16(-32768), Op.HALT)
     tos = tester.get_last_tos(tester.run_bytecode(bytecode))
     if tos == 4294934528 or tos == -32768:
         print("PASS")
@@ -47,23 +47,25 @@ def test_push():
     # 5. PUSH32 (Max Int)
     print("Test PUSH32 (0x7FFFFFFF)...", end="", flush=True)
     val = 0x7FFFFFFF
-    bytecode = [OP["PUSH32"]] + list(struct.pack("<I", val)) + [OP["HALT"]]
-    if tester.get_last_tos(tester.run_bytecode(bytecode)) == val:
+    bytecode = bc(push32(val), Op.HALT)
+    tos = tester.get_last_tos(tester.run_bytecode(bytecode))
+    if tos == val:
         print("PASS")
     else:
-        print(f"FAIL")
+        print(f"FAIL (tos={tos})")
 
     # 6. PUSH32 (-1)
     print("Test PUSH32 (-1)...", end="", flush=True)
     val = 0xFFFFFFFF
-    bytecode = [OP["PUSH32"]] + list(struct.pack("<I", val)) + [OP["HALT"]]
+    bytecode = bc(push32(val), Op.HALT)
     tos = tester.get_last_tos(tester.run_bytecode(bytecode))
     if tos == 0xFFFFFFFF or tos == -1:
         print("PASS")
     else:
         print(f"FAIL (tos={tos})")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
@@ -4,8 +4,10 @@ import time
 from language_tester import LanguageTester
 
 
-def run_tests():
-    tester = LanguageTester()
+def run_tests(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = LanguageTester()
     results = []
 
     print("\n--- TEST: SFC Single Step ---")
@@ -28,7 +30,8 @@ def run_tests():
         print(f"FAILED: {e}")
         results.append(False)
 
-    tester.close()
+    if owns_tester:
+        tester.close()
     return all(results)
 
 
@@ -1,15 +1,16 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, Op, bc, push8
 
 
-def test_stack_ops():
-    tester = ZPLCTester()
-    OP = tester.OP
+def test_stack_ops(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     print("\n--- Running Stack Operations Tests ---")
 
     # 1. DUP
     print("Test DUP (v42)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 42, OP["DUP"], OP["HALT"]]
+    bytecode = bc(push8(42), Op.DUP, Op.HALT)
     traces = tester.run_bytecode(bytecode)
     if tester.get_last_sp(traces) == 2 and tester.get_last_tos(traces) == 42:
         print("PASS")
@@ -20,7 +21,7 @@ def test_stack_ops():
 
     # 2. DROP
     print("Test DROP (v43)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 43, OP["PUSH8"], 10, OP["DROP"], OP["HALT"]]
+    bytecode = bc(push8(43), push8(10), Op.DROP, Op.HALT)
     traces = tester.run_bytecode(bytecode)
     if tester.get_last_sp(traces) == 1 and tester.get_last_tos(traces) == 43:
         print("PASS")
@@ -31,7 +32,7 @@ def test_stack_ops():
 
     # 3. SWAP
     print("Test SWAP (v44)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 44, OP["PUSH8"], 10, OP["SWAP"], OP["HALT"]]
+    bytecode = bc(push8(44), push8(10), Op.SWAP, Op.HALT)
     traces = tester.run_bytecode(bytecode)
     if tester.get_last_sp(traces) == 2 and tester.get_last_tos(traces) == 44:
         print("PASS")
@@ -42,7 +43,7 @@ def test_stack_ops():
 
     # 4. OVER
     print("Test OVER (v45)...", end="", flush=True)
-    bytecode = [OP["PUSH8"], 45, OP["PUSH8"], 10, OP["OVER"], OP["HALT"]]
+    bytecode = bc(push8(45), push8(10), Op.OVER, Op.HALT)
     traces = tester.run_bytecode(bytecode)
     if tester.get_last_sp(traces) == 3 and tester.get_last_tos(traces) == 45:
         print("PASS")
@@ -53,16 +54,7 @@ def test_stack_ops():
 
     # 5. ROT
     print("Test ROT...", end="", flush=True)
-    bytecode = [
-        OP["PUSH8"],
-        100,
-        OP["PUSH8"],
-        101,
-        OP["PUSH8"],
-        102,
-        OP["ROT"],
-        OP["HALT"],
-    ]
+    bytecode = bc(push8(100), push8(101), push8(102), Op.ROT, Op.HALT)
     traces = tester.run_bytecode(bytecode)
     if tester.get_last_sp(traces) == 3 and tester.get_last_tos(traces) == 100:
         print("PASS")
@@ -73,17 +65,7 @@ def test_stack_ops():
 
     # 6. PICK
     print("Test PICK...", end="", flush=True)
-    bytecode = [
-        OP["PUSH8"],
-        110,
-        OP["PUSH8"],
-        111,
-        OP["PUSH8"],
-        112,
-        OP["PICK"],
-        2,
-        OP["HALT"],
-    ]
+    bytecode = bc(push8(110), push8(111), push8(112), Op.PICK, 2, Op.HALT)
     traces = tester.run_bytecode(bytecode)
     if tester.get_last_sp(traces) == 4 and tester.get_last_tos(traces) == 110:
         print("PASS")
@@ -92,7 +74,8 @@ def test_stack_ops():
             f"FAIL (sp={tester.get_last_sp(traces)}, tos={tester.get_last_tos(traces)})"
         )
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,18 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, Op, bc, push8, push16
 import struct
 
 
-def test_strings():
-    tester = ZPLCTester()
-    OP = tester.OP
+def test_strings(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     # WORK memory for strings
     STR1 = 0x2100
     STR2 = 0x2200
+    # PUSH16 <addr> armado una vez por string
+    PUSH_STR1 = push16(STR1)
+    PUSH_STR2 = push16(STR2)
 
     print("\n--- Running String Operations Tests ---")
 
@@ -17,25 +21,11 @@ def test_strings():
     print("Test STRLEN...", end="", flush=True)
     header = struct.pack("<HH", 5, 10)
     data = b"Hello\0"
-    bytecode = [
-        OP["PUSH16"],
-        STR1 & 0xFF,
-        (STR1 >> 8) & 0xFF,
-        OP["PUSH8"],
-        42,  # Trash
-        OP["DROP"],
-        OP["STRLEN"],
-        OP["HALT"],
-    ]
+    bytecode = bc(PUSH_STR1, push8(42), Op.DROP, Op.STRLEN, Op.HALT)  # 42: trash
     # Necesitamos inicializar la memoria con el string
-    tester.reset_state()
-    # Poke memory for string header and data
-    tester.send(f"zplc dbg poke {STR1} {header[0]}")
-    tester.send(f"zplc dbg poke {STR1 + 1} {header[1]}")
-    tester.send(f"zplc dbg poke {STR1 + 2} {header[2]}")
-    tester.send(f"zplc dbg poke {STR1 + 3} {header[3]}")
-    for i, b in enumerate(data):
-        tester.send(f"zplc dbg poke {STR1 + 4 + i} {b}")
+    tester.reset_state(fast=True)
+    # Poke memory for string header and data (una sola escritura)
+    tester.poke_bulk(STR1, header + data)
 
     traces = tester.run_bytecode(bytecode, reset=False)
     if tester.get_last_tos(traces) == 5:
@@ -47,32 +37,14 @@ def test_strings():
     print("Test STRCPY...", end="", flush=True)
     # STR1: "ZPLC" (len 4, cap 10)
     # STR2: empty (len 0, cap 10)
-    tester.reset_state()
+    tester.reset_state(fast=True)
     # Init STR1
-    header1 = struct.pack("<HH", 4, 10)
-    for i in range(4):
-        tester.send(f"zplc dbg poke {STR1 + i} {header1[i]}")
-    for i, b in enumerate(b"ZPLC\0"):
-        tester.send(f"zplc dbg poke {STR1 + 4 + i} {b}")
+    tester.poke_bulk(STR1, struct.pack("<HH", 4, 10) + b"ZPLC\0")
     # Init STR2
-    header2 = struct.pack("<HH", 0, 10)
-    for i in range(4):
-        tester.send(f"zplc dbg poke {STR2 + i} {header2[i]}")
+    tester.poke_bulk(STR2, struct.pack("<HH", 0, 10))
 
-    bytecode = [
-        OP["PUSH16"],
-        STR1 & 0xFF,
-        (STR1 >> 8) & 0xFF,  # src
-        OP["PUSH16"],
-        STR2 & 0xFF,
-        (STR2 >> 8) & 0xFF,  # dst
-        OP["STRCPY"],
-        OP["PUSH16"],
-        STR2 & 0xFF,
-        (STR2 >> 8) & 0xFF,
-        OP["STRLEN"],
-        OP["HALT"],
-    ]
+    # src, dst, STRCPY; luego STRLEN(dst)
+    bytecode = bc(PUSH_STR1, PUSH_STR2, Op.STRCPY, PUSH_STR2, Op.STRLEN, Op.HALT)
     if tester.get_last_tos(tester.run_bytecode(bytecode, reset=False)) == 4:
         print("PASS")
     else:
@@ -81,26 +53,12 @@ def test_strings():
     # 3. STRCMP
     print("Test STRCMP...", end="", flush=True)
     # AAA vs BBB
-    bytecode = [
-        OP["PUSH16"],
-        STR1 & 0xFF,
-        (STR1 >> 8) & 0xFF,
-        OP["PUSH16"],
-        STR2 & 0xFF,
-        (STR2 >> 8) & 0xFF,
-        OP["STRCMP"],
-        OP["HALT"],
-    ]
+    bytecode = bc(PUSH_STR1, PUSH_STR2, Op.STRCMP, Op.HALT)
     # Init strings
-    tester.reset_state()
+    tester.reset_state(fast=True)
     h = struct.pack("<HH", 3, 10)
-    for i in range(4):
-        tester.send(f"zplc dbg poke {STR1 + i} {h[i]}")
-        tester.send(f"zplc dbg poke {STR2 + i} {h[i]}")
-    for i, b in enumerate(b"AAA\0"):
-        tester.send(f"zplc dbg poke {STR1 + 4 + i} {b}")
-    for i, b in enumerate(b"BBB\0"):
-        tester.send(f"zplc dbg poke {STR2 + 4 + i} {b}")
+    tester.poke_bulk(STR1, h + b"AAA\0")
+    tester.poke_bulk(STR2, h + b"BBB\0")
 
     tos = tester.get_last_tos(tester.run_bytecode(bytecode, reset=False))
 
@@ -110,7 +68,8 @@ def test_strings():
     else:
         print(f"FAIL (tos={tos})")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
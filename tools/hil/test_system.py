@@ -1,15 +1,16 @@
-from zplc_tester import ZPLCTester
+from zplc_tester import ZPLCTester, Op, bc
 
 
-def test_system():
-    tester = ZPLCTester()
-    OP = tester.OP
+def test_system(tester=None):
+    owns_tester = tester is None
+    if owns_tester:
+        tester = ZPLCTester()
 
     print("\n--- Running System Operations Tests ---")
 
     # 1. NOP
     print("Test NOP...", end="", flush=True)
-    bytecode = [OP["NOP"], OP["NOP"], OP["HALT"]]
+    bytecode = bc(Op.NOP, Op.NOP, Op.HALT)
     traces = tester.run_bytecode(bytecode)
     # PC should advance, no errors
     if any(t.get("op") == "NOP" for t in traces):
@@ -19,14 +20,15 @@ def test_system():
 
     # 2. GET_TICKS
     print("Test GET_TICKS...", end="", flush=True)
-    bytecode = [OP["GET_TICKS"], OP["HALT"]]
+    bytecode = bc(Op.GET_TICKS, Op.HALT)
     tos = tester.get_last_tos(tester.run_bytecode(bytecode))
     if tos is not None and tos > 0:
         print(f"PASS ({tos} ms)")
     else:
         print("FAIL")
 
-    tester.close()
+    if owns_tester:
+        tester.close()
 
 
 if __name__ == "__main__":
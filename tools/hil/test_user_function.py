@@ -1,12 +1,8 @@
 from zplc_tester import ZPLCTester
-import time
-import struct
 
-
-def h2f(bytes_list):
-    if len(bytes_list) < 4:
-        return 0.0
-    return struct.unpack("<f", bytearray(bytes_list))[0]
+# 0x1000: resultado (REAL), 0x1004: contador de ciclos (INT)
+OPI_FMT = "<fh"
+OPI_NAMES = ("res", "cycle")
 
 
 def test_user_function():
@@ -32,21 +28,17 @@ def test_user_function():
     tester.start_and_wait(duration=2.0)
 
     print("Peeking OPI memory...")
-    cycle_data = tester.peek(0x1004, 2)
-    cycle = 0
-    if len(cycle_data) == 2:
-        cycle = struct.unpack("<h", bytearray(cycle_data))[0]
-    print(f"DEBUG: PLC Cycles: {cycle}")
-
-    opi_data = tester.peek(0x1000, 4)
+    # Resultado y ciclos en un solo peek
+    vals = tester.peek_struct(0x1000, OPI_FMT, OPI_NAMES)
 
-    if len(opi_data) < 4:
-        print(f"ERROR: Incomplete data ({len(opi_data)} bytes)")
+    if vals is None:
+        print("ERROR: Incomplete data read")
 
         tester.close()
         return
 
-    res_val = h2f(opi_data)
+    print(f"DEBUG: PLC Cycles: {vals['cycle']}")
+    res_val = vals["res"]
 
     print("\n--- RESULTS ---")
     print(
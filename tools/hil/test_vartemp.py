@@ -1,12 +1,10 @@
-from zplc_tester import ZPLCTester
-import struct
+from zplc_tester import ZPLCTester, ST_DIR
 import os
 
 
 def test_vartemp():
     tester = ZPLCTester()
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    st_file = os.path.join(script_dir, "st_tests", "vartemp_hil.st")
+    st_file = os.path.join(ST_DIR, "vartemp_hil.st")
 
     print("\n====================================================")
     print("          ZPLC VAR_TEMP HIL TEST                    ")
@@ -27,15 +25,12 @@ def test_vartemp():
     # 0x2004: res1 (INT, 2 bytes)
     # 0x2006: res2 (INT, 2 bytes)
 
-    mem = tester.peek(0x2000, 8)
-    if not mem:
+    vals = tester.peek_struct(0x2000, "<4h", ("in", "tmp", "res1", "res2"))
+    if vals is None:
         print("FAIL: Could not read memory (PLC Crash?)")
         return False
 
-    in_val = struct.unpack("<h", bytearray(mem[0:2]))[0]
-    tmp_val = struct.unpack("<h", bytearray(mem[2:4]))[0]
-    res1 = struct.unpack("<h", bytearray(mem[4:6]))[0]
-    res2 = struct.unpack("<h", bytearray(mem[6:8]))[0]
+    in_val, tmp_val, res1, res2 = vals.values()
 
     print(f"in_val: {in_val}")
     print(f"tmp: {tmp_val}")
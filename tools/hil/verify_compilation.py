@@ -1,37 +1,66 @@
 import os
+import subprocess
 import sys
 import glob
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from compile_server import CompileServer
 
+# Resolve CLI path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+CLI_PATH = os.path.join(ROOT_DIR, "packages/zplc-ide/src/cli/index.ts")
 
-def compile_file(filepath):
-    """Compiles a single file using the ZPLC CLI."""
-    print(f"[{filepath}] Compiling...", end=" ")
 
-    # Resolve CLI path
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-    cli_path = os.path.join(root_dir, "packages/zplc-ide/src/cli/index.ts")
+# Un compile-server por hilo del pool (None si no pudo arrancar)
+_local = threading.local()
+_servers = []
+_servers_lock = threading.Lock()
+
 
-    # Output path
+def output_path(filepath):
+    """Output path for a source file."""
     base, _ = os.path.splitext(filepath)
     if filepath.endswith(".json"):
         # Remove .ld, .fbd, .sfc intermediate extension if present
         base, _ = os.path.splitext(base)
 
-    output_bin = base + ".zplc"
+    return base + ".zplc"
 
-    # Command
-    cmd = f"bun {cli_path} compile {filepath} -o {output_bin}"
 
-    result = os.system(cmd + " > /dev/null 2>&1")
+def compile_command(filepath):
+    """Builds the ZPLC CLI argv that compiles a single file."""
+    return ["bun", CLI_PATH, "compile", filepath, "-o", output_path(filepath)]
 
-    if result == 0:
-        print("OK ✅")
-        return True
-    else:
-        print("FAIL ❌")
-        # Run again to show error
-        os.system(cmd)
-        return False
+
+def _thread_server():
+    if not hasattr(_local, "server"):
+        try:
+            _local.server = CompileServer(CLI_PATH)
+        except OSError:
+            _local.server = None
+        else:
+            with _servers_lock:
+                _servers.append(_local.server)
+    return _local.server
+
+
+def compile_file(filepath):
+    """
+    Compiles a single file using the ZPLC CLI, without printing (safe to run
+    from several threads). Returns (filepath, ok, output); output is the CLI's
+    stdout + stderr, kept to report failures without compiling again.
+    Goes through this thread's compile-server, falling back to one bun per file.
+    """
+    server = _thread_server()
+    if server is not None:
+        try:
+            ok, output = server.compile(filepath, output_path(filepath))
+            return filepath, ok, output
+        except RuntimeError:
+            _local.server = None
+
+    result = subprocess.run(compile_command(filepath), capture_output=True, text=True)
+    return filepath, result.returncode == 0, result.stdout + result.stderr
 
 
 def main():
@@ -57,10 +86,24 @@ def main():
     success_count = 0
     fail_count = 0
 
-    for f in files:
-        if compile_file(f):
+    # Cada hilo usa su propio compile-server (un bun de larga vida; si no
+    # arranca, un bun por archivo). El trabajo lo hacen esos procesos y los
+    # hilos solo esperan su respuesta: un hilo, y un bun, por nucleo
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            results = list(pool.map(compile_file, files))
+    finally:
+        for server in _servers:
+            server.close()
+
+    for f, ok, output in results:
+        print(f"[{f}] Compiling...", end=" ")
+        if ok:
+            print("OK ✅")
             success_count += 1
         else:
+            print("FAIL ❌")
+            print(output.rstrip())
             fail_count += 1
 
     print("\n====================================================")
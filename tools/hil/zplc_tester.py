@@ -1,10 +1,247 @@
 import serial
+import atexit
+import threading
 import time
 import json
-import binascii
+import functools
+import hashlib
 import struct
+import subprocess
+import tempfile
 import os
 import re
+from types import SimpleNamespace
+from compile_server import CompileServer
+
+def u16(buf, off=0):
+    """Decodes an unsigned little-endian 16-bit value from peek() output."""
+    return int.from_bytes(buf[off : off + 2], "little")
+
+
+_I16 = struct.Struct("<h")
+_F32 = struct.Struct("<f")
+
+# Struct compilado por formato, reutilizado entre llamadas a peek_struct
+_layout = functools.lru_cache(maxsize=64)(struct.Struct)
+
+
+def h2i(buf, offset=0):
+    """Decodes an INT at offset of peek() output; 0 if the read came back short."""
+    if len(buf) < offset + 2:
+        return 0
+    return _I16.unpack_from(buf, offset)[0]
+
+
+def h2f(buf, offset=0):
+    """Decodes a REAL at offset of peek() output; 0.0 if the read came back short."""
+    if len(buf) < offset + 4:
+        return 0.0
+    return _F32.unpack_from(buf, offset)[0]
+
+
+def bc(*parts):
+    """
+    Builds a program as one contiguous bytearray from opcodes/operands (ints)
+    and already packed chunks (bytes), e.g. bc(push32(v), Op.HALT).
+    """
+    out = bytearray()
+    for part in parts:
+        if isinstance(part, int):
+            out.append(part)
+        else:
+            out += part
+    return out
+
+
+class Traces(list):
+    """
+    List of trace dicts (as returned before) that also indexes them by their
+    "t" field while they are captured: traces.by_type["error"] is O(1).
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.by_type = {}
+        for trace in self:
+            self.by_type.setdefault(trace.get("t"), []).append(trace)
+
+    def append(self, trace):
+        super().append(trace)
+        self.by_type.setdefault(trace.get("t"), []).append(trace)
+
+    def first(self, kind, default=None):
+        """First trace of the given type, or default."""
+        found = self.by_type.get(kind)
+        return found[0] if found else default
+
+
+def hil_ports():
+    """Serial ports listed in ZPLC_PORTS (comma separated), one per attached board."""
+    ports = os.environ.get("ZPLC_PORTS", "")
+    return [p.strip() for p in ports.split(",") if p.strip()]
+
+
+# Registro de opcode en modo "hil mode compact": ~OOPPPPSSTTTTTTTT (hex)
+_COMPACT_TRACE_RE = re.compile(r"~([0-9A-F]{16})")
+
+# Fila de zplc dbg peek: direccion, ":" y bytes de dos digitos hex
+_PEEK_ROW_RE = re.compile(r"^\s*(?:0x)?[0-9A-Fa-f]+:((?: [0-9A-Fa-f]{2})+)", re.M)
+
+# Tipos de trace JSON que entrega iter_capture (el resto de lineas se ignora)
+_TRACE_TYPES = frozenset({"opcode", "error", "task", "fb", "ack"})
+
+
+def _decode_compact_trace(record):
+    """
+    Converts a compact opcode record into the same dict verbose mode emits,
+    plus "code": the opcode as an int, cheaper to compare than the name.
+    """
+    tos = int(record[8:16], 16)
+    if tos & 0x80000000:
+        tos -= 1 << 32
+    op = int(record[0:2], 16)
+    return {
+        "t": "opcode",
+        "op": _OP_NAMES.get(op, "???"),
+        "code": op,
+        "pc": int(record[2:6], 16),
+        "sp": int(record[6:8], 16),
+        "tos": tos,
+    }
+
+
+# Rutas resueltas una vez por proceso
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ST_DIR = os.path.join(SCRIPT_DIR, "st_tests")
+ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, "../.."))
+CLI_PATH = os.path.join(ROOT_DIR, "packages/zplc-ide/src/cli/index.ts")
+
+# On-disk bytecode cache shared by every tester process (including parallel runs)
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+
+
+# Compiler sources (relative to the repo root) that invalidate cached bytecode
+_COMPILER_SOURCES = (
+    "packages/zplc-compiler/src",
+    "packages/zplc-ide/src/cli",
+    "packages/zplc-ide/src/compiler",
+    "packages/zplc-ide/src/transpiler",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _compiler_stamp(root_dir):
+    """Newest mtime among the compiler sources, computed once per process."""
+    newest = 0
+    for rel in _COMPILER_SOURCES:
+        for dirpath, _, files in os.walk(os.path.join(root_dir, rel)):
+            for name in files:
+                if name.endswith(".ts"):
+                    mtime = os.stat(os.path.join(dirpath, name)).st_mtime_ns
+                    newest = max(newest, mtime)
+    return newest
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def _bun_compile(cli_path, src, dst):
+    """
+    Compiles src into dst and returns (ok, output). With ZPLC_COMPILE_SERVER=1
+    every compile goes through one long-lived `bun ... compile-server` process
+    (see compile_server.py); otherwise, or if the server dies, one bun per file.
+    """
+    global _server
+    if os.environ.get("ZPLC_COMPILE_SERVER") == "1":
+        with _server_lock:
+            if _server is None:
+                try:
+                    _server = CompileServer(cli_path)
+                    atexit.register(_server.close)
+                except OSError:
+                    _server = False
+        if _server:
+            try:
+                return _server.compile(src, dst)
+            except RuntimeError as e:
+                print(f"WARN: {e}, compiling without the server")
+                _server = False
+
+    # argv directo, sin /bin/sh; la salida del CLI solo se muestra si falla
+    result = subprocess.run(
+        ["bun", cli_path, "compile", src, "-o", dst], capture_output=True, text=True
+    )
+    return result.returncode == 0, result.stdout + result.stderr
+
+
+def _write_atomic(path, data):
+    """
+    Escribe data en path via un temporal en el mismo directorio + os.replace:
+    quien lea path en paralelo ve el archivo viejo o el nuevo, nunca a medias.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_cached(cli_path, st_abs, bin_abs, mtime_ns, size, compiler_stamp=0):
+    """
+    Compiles st_abs once per (path, mtime, size) within a process. Results are
+    also stored under CACHE_DIR keyed by the SHA-1 of the source and the
+    compiler stamp, so unchanged sources skip the compiler across runs until
+    the compiler itself changes. Set ZPLC_COMPILE_CACHE=0 to bypass the disk cache.
+    """
+    use_disk = os.environ.get("ZPLC_COMPILE_CACHE", "1") != "0"
+    with open(st_abs, "rb") as f:
+        sha = hashlib.sha1(f.read())
+    sha.update(str(compiler_stamp).encode())
+    digest = sha.hexdigest()
+    cached_bin = os.path.join(CACHE_DIR, f"{digest}.bin")
+
+    if use_disk and os.path.exists(cached_bin):
+        with open(cached_bin, "rb") as f:
+            data = f.read()
+        # El .zplc junto al fuente lo usan otras herramientas (inspect_zplc):
+        # regenerarlo si falta o quedo mas viejo que el fuente
+        try:
+            stale = os.stat(bin_abs).st_mtime_ns < mtime_ns
+        except FileNotFoundError:
+            stale = True
+        if stale:
+            _write_atomic(bin_abs, data)
+        return data
+
+    ok, output = _bun_compile(cli_path, st_abs, bin_abs)
+    if not ok:
+        raise Exception(f"Compilation failed for {st_abs}\n{output.strip()}")
+
+    with open(bin_abs, "rb") as f:
+        data = f.read()
+
+    if use_disk:
+        # Otro worker puede leer cached_bin en cualquier momento
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _write_atomic(cached_bin, data)
+
+    return data
+
+
+# Estado inicial de ZPLCTester._trace_ops: filtro del firmware desconocido
+_FILTER_UNKNOWN = object()
+
+# Bytes por comando "zplc data" (override: ZPLC_UPLOAD_CHUNK)
+UPLOAD_CHUNK_BYTES = int(os.environ.get("ZPLC_UPLOAD_CHUNK", "256"))
+# "zplc data" enviados sin esperar su OK: (override: ZPLC_UPLOAD_WINDOW).
+# Mientras el shell ejecuta uno, los otros W-1 esperan en el ring RX:
+# (W-1) * ~525 bytes tiene que caber en 1024 (ESP32-S3) / 4096 (resto).
+UPLOAD_WINDOW = int(os.environ.get("ZPLC_UPLOAD_WINDOW", "2"))
 
 
 class ZPLCTester:
@@ -121,45 +358,74 @@ class ZPLCTester:
         print(f"DEBUG: Using port {port}")
 
         self.ser = serial.Serial(port, baud, timeout=1)
-        time.sleep(1)
+        # Filtro de opcodes activo en el firmware (None = todos). Arranca
+        # desconocido: el filtro sobrevive a reset y a cerrar el puerto, una
+        # sesion anterior pudo dejarlo acotado
+        self._trace_ops = _FILTER_UNKNOWN
+        self._trace_filter_unsupported = False
+        # Ultimo modo hil confirmado por el firmware (None = desconocido)
+        self._hil_mode = None
+        self._hil_modes_unsupported = set()
+        self._pokehex_unsupported = False
+        # Bytes por "zplc data"; se reduce a la mitad si el firmware no los absorbe
+        self.upload_chunk_bytes = UPLOAD_CHUNK_BYTES
+        # En vez de dormir 1 s fijo: pedir un prompt y seguir apenas llega
+        # (timeout del puerto = 1 s, el mismo tope de antes)
+        self.ser.write(b"\r\n")
+        self.ser.read_until(b"zplc:~$")
+        self.ser.reset_input_buffer()
 
     def close(self):
+        # No dejar la placa con un filtro de opcodes acotado para la proxima
+        # sesion (p.ej. un stream_st(trace_ops=...) cortado antes de tiempo)
+        if self._trace_ops is not None and not self._trace_filter_unsupported:
+            try:
+                self.set_trace_filter(None)
+            except serial.SerialException:
+                pass
         self.ser.close()
 
     def send(self, cmd, wait_for="zplc:~$", timeout=5.0):
-        """Envia un comando y espera el prompt o una respuesta específica."""
-        while self.ser.in_waiting:
-            self.ser.read(self.ser.in_waiting)
-
+        """
+        Envia un comando y espera el prompt o una respuesta específica.
+        read_until bloquea en el driver y retorna apenas llega wait_for
+        (o al vencer timeout), sin sondear ni leer byte a byte.
+        """
+        self.ser.reset_input_buffer()
         self.ser.write(f"{cmd}\r\n".encode())
 
-        start = time.time()
-        response = ""
-        while time.time() - start < timeout:
-            if self.ser.in_waiting > 0:
-                char = self.ser.read().decode("utf-8", errors="ignore")
-                response += char
-                if wait_for in response:
-                    break
-            else:
-                time.sleep(0.01)
-        return response
+        prev_timeout = self.ser.timeout
+        self.ser.timeout = timeout
+        try:
+            raw = self.ser.read_until(wait_for.encode())
+        finally:
+            self.ser.timeout = prev_timeout
+        return raw.decode("utf-8", errors="ignore")
 
-    def reset_state(self):
+    def reset_state(self, fast=False):
+        """
+        Para y resetea la VM y borra lo persistido. fast=True es para tests
+        que no usan persistencia: sin "persist clear" ni la espera fija, el
+        OK: de "zplc reset" ya confirma que el reset termino.
+        """
         self.send("zplc stop")
-        self.send("zplc reset")
-        self.send("zplc persist clear")
-        time.sleep(0.5)
+        if fast:
+            self.send("zplc reset", wait_for="OK:", timeout=2.0)
+        else:
+            self.send("zplc reset")
+            self.send("zplc persist clear")
+        # Un reset completo vuelve a confirmar el modo hil en el proximo uso
+        self._hil_mode = None
+        if not fast:
+            time.sleep(0.5)
 
     def upload_bytecode(self, bytecode):
         self.send("zplc stop")
         self.send("zplc reset")
 
-        # Retry load command
+        # Retry load command (send() ya descarta la entrada pendiente)
         resp = ""
         for attempt in range(3):
-            while self.ser.in_waiting:
-                self.ser.read()
             resp = self.send(f"zplc load {len(bytecode)}", wait_for="OK:", timeout=5.0)
             if "OK:" in resp:
                 break
@@ -169,84 +435,309 @@ class ZPLCTester:
             print(f"ERROR: zplc load failed. Resp: {resp}")
             return
 
-        hex_data = binascii.hexlify(bytearray(bytecode)).decode()
-        chunk_size = 32  # Safe size (32 hex chars = 16 bytes)
-
-        for i in range(0, len(hex_data), chunk_size):
-            chunk = hex_data[i : i + chunk_size]
+        # bytes/bytearray van directo; listas de ints siguen funcionando
+        if not isinstance(bytecode, (bytes, bytearray)):
+            bytecode = bytes(bytecode)
+        data = memoryview(bytecode)
+        # Bloques grandes: cada "zplc data" ya espera su OK:, asi que el coste
+        # es por comando, no por byte. 256 bytes = 512 hex chars, holgado para
+        # CONFIG_SHELL_CMD_BUFF_SIZE (1024 en ESP32-S3, 4096 en el resto).
+        if UPLOAD_WINDOW > 1 and self._upload_windowed(data, UPLOAD_WINDOW):
+            self.send("")
+            return
 
+        # Sin ventana, o se perdio un OK: en la ventana: "zplc load" reinicia
+        # la recepcion y se manda bloque por bloque con reintentos
+        if UPLOAD_WINDOW > 1:
+            print("WARN: windowed upload failed, retrying chunk by chunk")
+            if "OK:" not in self.send(f"zplc load {len(data)}", wait_for="OK:", timeout=5.0):
+                print("ERROR: zplc load failed on retry")
+                return
+        pos = 0
+        while pos < len(data):
             # Retry logic for chunks
             for attempt in range(3):
-                # Clear input buffer to avoid stale data
-                while self.ser.in_waiting:
-                    self.ser.read(self.ser.in_waiting)
-
-                resp = self.send(f"zplc data {chunk}", wait_for="OK:", timeout=5.0)
+                chunk = data[pos : pos + self.upload_chunk_bytes]
+                resp = self.send(f"zplc data {chunk.hex()}", wait_for="OK:", timeout=5.0)
                 if "OK:" in resp:
                     break
-                print(f"WARN: Chunk {i} retry {attempt + 1}. Resp: {resp}")
+                print(f"WARN: Chunk {pos} retry {attempt + 1}. Resp: {resp}")
+                # Back-pressure: el firmware no absorbio el bloque, seguir con
+                # la mitad (queda asi para el resto de la sesion)
+                self.upload_chunk_bytes = max(16, self.upload_chunk_bytes // 2)
                 time.sleep(0.5)
             else:
-                print(f"ERROR: zplc data chunk {i} failed after retries")
+                print(f"ERROR: zplc data chunk {pos} failed after retries")
                 return
-
-            time.sleep(0.05)  # Small delay between chunks
+            pos += len(chunk)
 
         self.send("")
 
-    def start_and_capture(self, duration=1.0):
-        """Manda zplc start y captura los traces en modo verbose."""
-        self.send("zplc hil mode verbose")
+    def _upload_windowed(self, data, window):
+        """
+        Manda los "zplc data" con hasta `window` sin confirmar y va leyendo
+        los OK: a medida que llegan, asi el envio de un bloque se solapa con
+        el procesamiento del anterior. False si falta algun OK: o hay ERROR
+        (no se sabe que bloque fallo; el llamador rehace la carga).
+        """
+        size = self.upload_chunk_bytes
+        self.ser.reset_input_buffer()
+        prev_timeout = self.ser.timeout
+        self.ser.timeout = 5.0
+        try:
+            pending = 0
+            for pos in range(0, len(data), size):
+                if pending == window:
+                    if not self._read_ack():
+                        return False
+                    pending -= 1
+                self.ser.write(f"zplc data {data[pos : pos + size].hex()}\r\n".encode())
+                pending += 1
+            return all(self._read_ack() for _ in range(pending))
+        finally:
+            self.ser.timeout = prev_timeout
+
+    def _read_ack(self):
+        # El eco del comando es hex en minusculas: no contiene OK: ni ERROR
+        raw = self.ser.read_until(b"OK:")
+        return raw.endswith(b"OK:") and b"ERROR" not in raw
+
+    def start_and_capture(self, duration=1.0, trace_ops=None):
+        """
+        Manda zplc start y captura los traces. Usa el modo compact (registros
+        hex de ancho fijo, ~1/3 de bytes) y cae a verbose si el firmware no lo
+        soporta; en ambos casos devuelve los mismos dicts.
+        """
+        return Traces(self.iter_capture(duration, trace_ops))
+
+    def set_hil_mode(self, mode):
+        """
+        zplc hil mode <mode>, solo si el firmware no esta ya en ese modo (el
+        modo solo cambia por este comando). Devuelve False si el firmware no
+        lo acepta; un modo rechazado no se vuelve a pedir.
+        """
+        if mode == self._hil_mode:
+            return True
+        if mode in self._hil_modes_unsupported:
+            return False
+        resp = self.send(f"zplc hil mode {mode}")
+        if '"ok":true' not in resp:
+            if '"ok":false' in resp:
+                self._hil_modes_unsupported.add(mode)
+            self._hil_mode = None
+            return False
+        self._hil_mode = mode
+        return True
+
+    def set_trace_filter(self, trace_ops=None):
+        """
+        Limita los traces de opcode a los nombres dados (None = todos) con
+        zplc hil filter; el VM no formatea ni envia el resto. Solo manda el
+        comando si el filtro cambia. Devuelve False si el firmware no lo
+        soporta (en ese caso iter_capture filtra del lado Python).
+        """
+        if self._trace_filter_unsupported:
+            return False
+        trace_ops = frozenset(trace_ops) if trace_ops else None
+        if trace_ops == self._trace_ops:
+            return True
+        arg = ",".join(sorted(trace_ops)) if trace_ops else "all"
+        resp = self.send(f"zplc hil filter {arg}")
+        if '"ok":true' not in resp:
+            # Firmware sin "hil filter" (el shell no conoce el comando): no
+            # hay filtro que restaurar y no tiene sentido volver a pedirlo
+            if "not found" in resp:
+                self._trace_filter_unsupported = True
+            elif trace_ops is not None and self._trace_ops is not None:
+                # Lista rechazada (nombre o largo): abrir el filtro para que
+                # el filtrado del lado Python vea todos los opcodes
+                self.set_trace_filter(None)
+            return False
+        self._trace_ops = trace_ops
+        return True
+
+    def iter_capture(self, duration=1.0, trace_ops=None):
+        """
+        Igual que start_and_capture pero entrega cada trace apenas llega, sin
+        acumularlos. Cortar la iteracion antes termina la captura.
+        trace_ops limita los traces de opcode a esos nombres (ver
+        set_trace_filter); los demas tipos de trace no se filtran.
+        """
+        device_filtered = self.set_trace_filter(trace_ops)
+        py_ops = None if device_filtered or not trace_ops else frozenset(trace_ops)
+        if not self.set_hil_mode("compact"):
+            self.set_hil_mode("verbose")
         self.ser.reset_input_buffer()
         self.ser.write(b"zplc start\r\n")
 
-        traces = []
+        # Lectura por bloques y decodificacion por linea completa: cada byte
+        # se mira una sola vez, sin re-escanear el buffer por cada caracter
+        decoder = json.JSONDecoder()
         start_time = time.time()
-        buffer = ""
+        pending = b""
 
         while time.time() - start_time < duration:
-            if self.ser.in_waiting > 0:
-                char = self.ser.read().decode("utf-8", errors="ignore")
-                buffer += char
-
-                if "}" in buffer:
-                    start_idx = buffer.find("{")
-                    end_idx = buffer.find("}")
-
-                    if start_idx != -1 and end_idx > start_idx:
-                        json_str = buffer[start_idx : end_idx + 1]
-                        try:
-                            data = json.loads(json_str)
-                            if data.get("t") in [
-                                "opcode",
-                                "error",
-                                "task",
-                                "fb",
-                                "ack",
-                            ]:
-                                traces.append(data)
-                        except json.JSONDecodeError:
-                            pass
-                        buffer = buffer[end_idx + 1 :]
-            else:
+            waiting = self.ser.in_waiting
+            if not waiting:
                 time.sleep(0.01)
-        return traces
+                continue
+            pending += self.ser.read(waiting)
+            *lines, pending = pending.split(b"\n")
+
+            for raw in lines:
+                line = raw.decode("utf-8", errors="ignore")
+                match = _COMPACT_TRACE_RE.search(line)
+                if match:
+                    trace = _decode_compact_trace(match.group(1))
+                    if py_ops is None or trace["op"] in py_ops:
+                        yield trace
+                    continue
 
-    def start_and_wait(self, duration=1.0):
-        """Manda zplc start en modo off y espera."""
-        self.send("zplc hil mode off")
+                start_idx = line.find("{")
+                if start_idx == -1:
+                    continue
+                try:
+                    data, _ = decoder.raw_decode(line, start_idx)
+                except ValueError:
+                    continue
+                if not isinstance(data, dict):
+                    continue
+                kind = data.get("t")
+                if kind == "opcode":
+                    # Mismo campo "code" que el modo compact
+                    data["code"] = self.OP.get(data.get("op"))
+                    if py_ops is None or data["op"] in py_ops:
+                        yield data
+                elif kind in _TRACE_TYPES:
+                    yield data
+
+    def start_and_wait(self, duration=1.0, trace=False):
+        """
+        Manda zplc start y espera. Con trace=False (tests que solo miran la
+        memoria final) el firmware queda en modo off y no emite ningun trace.
+        """
+        self.set_hil_mode("summary" if trace else "off")
         self.ser.reset_input_buffer()
         resp = self.send("zplc start")
         print(f"DEBUG: Start response: {resp.strip()}")
         time.sleep(duration)
         self.send("zplc stop")
 
+    def start_and_wait_flag(self, flag_addr, timeout=10.0):
+        """
+        Como start_and_wait, pero termina apenas el programa pone en != 0 el
+        byte flag_addr (su marca de "secuencia terminada"). Consulta con
+        backoff exponencial (5 ms .. 100 ms); timeout es el tope de antes.
+        Devuelve True si el flag aparecio antes del timeout.
+        """
+        self.set_hil_mode("off")
+        self.ser.reset_input_buffer()
+        resp = self.send("zplc start")
+        print(f"DEBUG: Start response: {resp.strip()}")
+
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        done = False
+        while time.monotonic() < deadline:
+            flag = self.peek(flag_addr, 1)
+            if flag and flag[0]:
+                done = True
+                break
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 1.5, 0.1)
+
+        self.send("zplc stop")
+        return done
+
+    def run_ticks(self, n=1):
+        """
+        Ejecuta n ciclos con zplc dbg step. En modo scheduler el comando solo
+        retorna cuando el ciclo termino, asi que la respuesta es la confirmacion
+        y no hace falta dormir. Devuelve False si algun paso no se confirmo.
+        """
+        for _ in range(n):
+            resp = self.send("zplc dbg step")
+            if "step complete" not in resp:
+                return False
+        return True
+
+    def run_script(self, steps):
+        """
+        Ejecuta un test guionado con la VM detenida entre pasos.
+        steps: lista de tuplas, en orden:
+          ("poke", addr, value)   escribe un byte
+          ("run", seconds)        zplc start, espera, zplc stop
+          ("ticks", n)            ejecuta n ciclos confirmados (run_ticks)
+          ("peek", addr, length)  lee memoria (se agrega al resultado)
+        Devuelve la lista de bytes leidos por los pasos "peek". Si un "ticks"
+        no se confirma, el "peek" siguiente devuelve b"" (el paso fallo) en
+        vez de memoria que no avanzo.
+        """
+        self.set_hil_mode("off")
+        results = []
+        step_failed = False
+        for step in steps:
+            op = step[0]
+            if op == "poke":
+                self.send(f"zplc dbg poke 0x{step[1]:x} {step[2]}")
+            elif op == "run":
+                self.send("zplc start")
+                time.sleep(step[1])
+                self.send("zplc stop")
+            elif op == "ticks":
+                if not self.run_ticks(step[1]):
+                    print(f"WARN: zplc dbg step {step[1]} was not acknowledged")
+                    step_failed = True
+            elif op == "peek":
+                results.append(b"" if step_failed else self.peek(step[1], step[2]))
+                step_failed = False
+            else:
+                raise ValueError(f"Unknown script step: {op}")
+        return results
+
+    def watch_stream(self, watches, duration=1.0, period_ms=10):
+        """
+        Runs the program while the firmware streams watch events (zplc hil watch).
+        watches: list of (addr, type) pairs, e.g. [(0x1000, "u8")].
+        Returns a list of (timestamp, addr, value) tuples: the values at start
+        followed by one entry per change seen by the firmware poller.
+        """
+        self.set_hil_mode("summary")
+        self.send("zplc hil watch clear")
+        self.send(f"zplc hil watch period {period_ms}")
+        for addr, wtype in watches:
+            self.send(f"zplc hil watch add {addr} {wtype}")
+
+        self.ser.reset_input_buffer()
+        self.ser.write(b"zplc start\r\n")
+        # Force one emit of every watch so the caller gets a baseline
+        self.ser.write(b"zplc hil watch poll\r\n")
+
+        events = []
+        start_time = time.time()
+        while time.time() - start_time < duration:
+            line = self.ser.readline()
+            if b'"watch"' not in line:
+                continue
+            try:
+                data = json.loads(line[line.find(b"{") :])
+            except json.JSONDecodeError:
+                continue
+            if data.get("t") == "watch":
+                events.append((time.time() - start_time, data["addr"], data["val"]))
+
+        self.send("zplc stop")
+        self.send("zplc hil watch clear")
+        self.set_hil_mode("off")
+        return events
+
     def peek(self, addr, length=1):
         """
-        Reads memory from the device using zplc dbg peek.
+        Reads memory from the device using zplc dbg peek and returns it as
+        bytes (b"" on failure), ready for struct.unpack_from / int.from_bytes.
         Handles potentially noisy output (logs) and retries on empty reads.
         """
-        cmd = f"zplc dbg peek {hex(addr)} {length}"
+        cmd = f"zplc dbg peek 0x{addr:x} {length}"
         
         for attempt in range(3):
             # Clear any pending logs
@@ -254,46 +745,110 @@ class ZPLCTester:
             
             resp = self.send(cmd, wait_for="zplc:~$")
             
-            # Parse hex values only from lines that look like memory dumps:
-            # "0x20001004: 00 00 ..." or just raw hex data depending on formatting
-            # We look for lines containing ":" and hex bytes
-            
-            bytes_out = []
-            for line in resp.splitlines():
-                line = line.strip()
-                # Ignore log lines starting with [HAL], [ERR], etc.
-                if line.startswith("[") or not line:
-                    continue
-                    
-                # Standard hexdump format: "0xaddr: byte byte ..."
-                if ":" in line:
-                    parts = line.split(":")
-                    if len(parts) > 1:
-                        data_part = parts[1]
-                        # Find all 2-digit hex sequences
-                        hex_matches = re.findall(r"\b([0-9A-Fa-f]{2})\b", data_part)
-                        for hv in hex_matches:
-                            bytes_out.append(int(hv, 16))
-            
-            if len(bytes_out) >= length:
-                return bytes_out[:length]
+            # Filas de volcado "1000: AA BB ..." (o "0x20001004: ..."): una
+            # sola regex sobre toda la respuesta y un solo bytes.fromhex, que
+            # ignora los espacios. Los logs ([HAL], [ERR]...) no calzan.
+            data = bytes.fromhex("".join(_PEEK_ROW_RE.findall(resp)))
+
+            if len(data) >= length:
+                return data[:length]
             
             # If we are here, we didn't get enough bytes. Wait a bit and retry.
             time.sleep(0.2)
             
-        return []  # Return empty if failed after retries
+        return b""  # Return empty if failed after retries
 
+    # Limite de zplc dbg pokehex (SHELL_FORCE_MAX_BYTES en shell_cmds.c)
+    POKEHEX_MAX_BYTES = 256
+
+    def poke_bulk(self, addr, data):
+        """
+        Writes data (bytes or a list of ints) starting at addr with zplc dbg
+        pokehex: one round-trip per POKEHEX_MAX_BYTES instead of one per byte.
+        Falls back to per-byte zplc dbg poke on firmware without pokehex.
+        Returns True if every write was confirmed.
+        """
+        data = bytes(data)
+        if not self._pokehex_unsupported:
+            for off in range(0, len(data), self.POKEHEX_MAX_BYTES):
+                chunk = data[off : off + self.POKEHEX_MAX_BYTES]
+                resp = self.send(f"zplc dbg pokehex 0x{addr + off:x} {chunk.hex()}")
+                if "OK:" not in resp:
+                    break
+            else:
+                return True
+            if "ERROR" in resp:
+                return False
+            # Sin respuesta OK ni ERROR: firmware sin pokehex
+            self._pokehex_unsupported = True
+
+        ok = True
+        for i, b in enumerate(data):
+            ok &= "OK:" in self.send(f"zplc dbg poke {addr + i} {b}")
+        return ok
+
+    # Limits of zplc dbg mpeek (MPEEK_MAX_ENTRIES / MPEEK_MAX_BYTES in shell_cmds.c)
+    MPEEK_MAX_ENTRIES = 16
+    MPEEK_MAX_BYTES = 256
+
+    def mpeek(self, regions):
+        """
+        Reads several (addr, length) regions with zplc dbg mpeek, so K reads
+        cost one round-trip instead of K. Requests over the firmware limits are
+        split into as few commands as possible.
+        Returns one bytes object per region, in order (b"" if it failed).
+        """
+        results = []
+        batch, batch_bytes = [], 0
+        for addr, length in regions:
+            if batch and (
+                len(batch) == self.MPEEK_MAX_ENTRIES
+                or batch_bytes + length > self.MPEEK_MAX_BYTES
+            ):
+                results += self._mpeek_batch(batch)
+                batch, batch_bytes = [], 0
+            batch.append((addr, length))
+            batch_bytes += length
+        if batch:
+            results += self._mpeek_batch(batch)
+        return results
+
+    def _mpeek_batch(self, batch):
+        spec = ",".join(f"0x{addr:x}:{length}" for addr, length in batch)
+        self.ser.reset_input_buffer()
+        resp = self.send(f"zplc dbg mpeek {spec}")
+
+        # The JSON reply is printed over several lines: {"t":"mpeek","results":[ ... ]}
+        start = resp.find('{"t":"mpeek"')
+        end = resp.find("]}", start)
+        if start == -1 or end == -1:
+            return [b""] * len(batch)
+        try:
+            data = json.loads(resp[start : end + 2])
+        except json.JSONDecodeError:
+            return [b""] * len(batch)
+        found = [bytes.fromhex(r.get("bytes", "")) for r in data.get("results", [])]
+        return found + [b""] * (len(batch) - len(found))
+
+    def peek_struct(self, addr, fmt, names):
+        """
+        Reads the region described by fmt (a struct format, pad bytes "x"
+        included) with one peek and decodes every field in a single unpack.
+        Returns {name: value} in names order, or None if the read came back short.
+        """
+        layout = _layout(fmt)
+        buf = self.peek(addr, layout.size)
+        if len(buf) < layout.size:
+            return None
+        return dict(zip(names, layout.unpack_from(buf)))
 
     def compile_st(self, st_file):
         base, ext = os.path.splitext(st_file)
         output_bin = base + ".zplc"
 
-        root_dir = os.path.join(os.path.dirname(__file__), "../..")
-        cli_path = os.path.join(root_dir, "packages/zplc-ide/src/cli/index.ts")
-
         # Resolve relative paths from repo root (handles tools/hil/, packages/, etc.)
         if not os.path.isabs(st_file):
-            st_abs = os.path.abspath(os.path.join(root_dir, st_file))
+            st_abs = os.path.abspath(os.path.join(ROOT_DIR, st_file))
             base_abs, _ = os.path.splitext(st_abs)
             output_bin = base_abs + ".zplc"
         else:
@@ -303,48 +858,129 @@ class ZPLCTester:
             os.path.abspath(output_bin) if not os.path.isabs(output_bin) else output_bin
         )
 
-        cmd = f"bun {cli_path} compile {st_abs} -o {bin_abs}"
-        result = os.system(cmd)
-        if result != 0:
-            raise Exception(f"Compilation failed for {st_file}")
+        st = os.stat(st_abs)
+        bytecode = _compile_cached(
+            CLI_PATH,
+            st_abs,
+            bin_abs,
+            st.st_mtime_ns,
+            st.st_size,
+            _compiler_stamp(ROOT_DIR),
+        )
+        return list(bytecode)
 
-        with open(bin_abs, "rb") as f:
-            return list(f.read())
+    def run_st(self, st_file, reset=True, duration=2.0, trace_ops=None):
+        bytecode = self.compile_st(st_file)
+        if reset:
+            self.reset_state()
+        self.upload_bytecode(bytecode)
+        return self.start_and_capture(duration=duration, trace_ops=trace_ops)
 
-    def run_st(self, st_file, reset=True, duration=2.0):
+    def stream_st(self, st_file, reset=True, duration=2.0, trace_ops=None):
+        """Like run_st, but yields traces as they arrive (see iter_capture)."""
         bytecode = self.compile_st(st_file)
         if reset:
             self.reset_state()
         self.upload_bytecode(bytecode)
-        return self.start_and_capture(duration=duration)
+        yield from self.iter_capture(duration=duration, trace_ops=trace_ops)
 
     def run_bytecode(self, bytecode, reset=True, duration=0.5):
         """
-        Upload raw bytecode (list of bytes) and run, capturing traces.
-        Returns list of trace dicts from verbose mode.
+        Upload raw bytecode (bytes/bytearray, or a list of ints) and run,
+        capturing traces.
+        Returns list of trace dicts from verbose mode (a Traces, also
+        indexed by type).
         """
         if reset:
             self.reset_state()
         self.upload_bytecode(bytecode)
         return self.start_and_capture(duration=duration)
 
+    def run_many(self, checks, duration=0.5):
+        """
+        Runs (bytecode, expected_tos) pairs in order and stops at the first
+        mismatch. The full reset_state() is paid only once; upload_bytecode
+        already stops and resets the VM before each later program.
+        Returns the TOS values obtained (shorter than checks on failure).
+        """
+        results = []
+        for i, (bytecode, expected) in enumerate(checks):
+            traces = self.run_bytecode(bytecode, reset=(i == 0), duration=duration)
+            tos = self.get_last_tos(traces)
+            results.append(tos)
+            if tos != expected:
+                break
+        return results
+
+    def get_last_opcode(self, traces, field=None):
+        """
+        Returns the last opcode trace (the last one holding `field`, if
+        given), or None. Walks backwards and stops at the first hit; a
+        Traces already keeps its opcode traces apart, so nothing else is
+        scanned.
+        """
+        if isinstance(traces, Traces):
+            candidates = reversed(traces.by_type.get("opcode", ()))
+        else:
+            candidates = (t for t in reversed(traces) if t.get("t") == "opcode")
+        for trace in candidates:
+            if field is None or field in trace:
+                return trace
+        return None
+
     def get_last_tos(self, traces):
         """
         Extract the last TOS (top-of-stack) value from opcode traces.
         Returns None if no opcode traces found.
         """
-        for trace in reversed(traces):
-            if trace.get("t") == "opcode" and "tos" in trace:
-                return trace["tos"]
-        return None
+        trace = self.get_last_opcode(traces, "tos")
+        return None if trace is None else trace["tos"]
 
     def get_last_sp(self, traces):
         """
         Extract the last SP (stack pointer) value from opcode traces.
         Returns None if no opcode traces found.
         """
-        for trace in reversed(traces):
-            if trace.get("t") == "opcode" and "sp" in trace:
-                return trace["sp"]
-        return None
+        trace = self.get_last_opcode(traces, "sp")
+        return None if trace is None else trace["sp"]
+
+    def last_state(self, traces):
+        """
+        Returns (tos, sp, pc) from the last opcode trace in a single pass.
+        Each field is None if no opcode traces were found.
+        """
+        last = self.get_last_opcode(traces)
+        if last is None:
+            return None, None, None
+        return last.get("tos"), last.get("sp"), last.get("pc")
+
+
+_OP_NAMES = {code: name for name, code in ZPLCTester.OP.items()}
+
+# Opcodes como atributos (Op.PUSH8) para armar programas sin lookups en OP
+Op = SimpleNamespace(**ZPLCTester.OP)
+
+_S_H = struct.Struct("<H")
+_S_I = struct.Struct("<I")
+_PUSH16 = bytes((Op.PUSH16,))
+_PUSH32 = bytes((Op.PUSH32,))
+
+
+def push8(value):
+    """PUSH8 <value> as bytes (negatives are stored two's complement)."""
+    return bytes((Op.PUSH8, value & 0xFF))
+
+
+def push16(value):
+    """PUSH16 <value> as bytes, operand little-endian."""
+    return _PUSH16 + _S_H.pack(value & 0xFFFF)
+
+
+def push32(value):
+    """PUSH32 <value> as bytes, operand little-endian."""
+    return _PUSH32 + _S_I.pack(value & 0xFFFFFFFF)
+
 
+def op_addr(opcode, addr):
+    """Opcode with a 16-bit address operand (LOAD*/STORE*/JMP/...) as bytes."""
+    return bytes((opcode,)) + _S_H.pack(addr)
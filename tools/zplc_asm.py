@@ -10,6 +10,7 @@ It's designed for development, testing, and educational purposes.
 Usage:
     python zplc_asm.py input.asm -o output.zplc
     python zplc_asm.py input.asm --raw -o output.bin  # Raw bytecode, no header
+    python zplc_asm.py a.asm b.asm c.asm              # Several files, in parallel
     python zplc_asm.py --help
 
 Example assembly:
@@ -24,9 +25,11 @@ Author: ZPLC Project
 """
 
 import argparse
+import os
 import struct
 import sys
-import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import IntEnum
 from pathlib import Path
@@ -160,9 +163,29 @@ def get_operand_size(opcode: int) -> int:
         return 4
 
 
+def _is_identifier(s: str) -> bool:
+    """True for [a-zA-Z_][a-zA-Z0-9_]* (isidentifier alone allows Unicode)."""
+    return s.isascii() and s.isidentifier()
+
+
+# Character literal escapes ('\n' etc.) and number prefixes -> base
+_CHAR_ESCAPES = {'n': 10, 'r': 13, 't': 9, '\\': 92, "'": 39, '0': 0}
+_BASE_PREFIXES = {'0x': 16, '0b': 2, '0o': 8}
+
+# Little-endian operand encoders
+U16 = struct.Struct('<H')
+U32 = struct.Struct('<I')
+
 # Build lookup tables
 OPCODE_BY_NAME = {op.name: op for op in Opcode}
-OPERAND_SIZE = {op: get_operand_size(op.value) for op in Opcode}
+# Operand size for every byte value 0x00-0xFF (indexable by int or Opcode)
+OPERAND_SIZE = tuple(get_operand_size(value) for value in range(256))
+# Mnemonic for every byte value 0x00-0xFF (None = undefined opcode)
+_names = {op.value: op.name for op in Opcode}
+OPCODE_NAME = tuple(_names.get(value) for value in range(256))
+del _names
+# Relative jumps take a signed 8-bit offset from PC + 2
+RELATIVE_JUMPS = frozenset((Opcode.JR, Opcode.JRZ, Opcode.JRNZ))
 
 
 # =============================================================================
@@ -181,6 +204,10 @@ class Token:
 @dataclass
 class Instruction:
     """A parsed instruction."""
+    # One per source instruction: slots keep them small and attribute access
+    # fast in resolve_labels/emit_bytecode (no per-instance __dict__)
+    __slots__ = ('opcode', 'operand', 'operand_label', 'line_num', 'address')
+    
     opcode: Opcode
     operand: Optional[int]
     operand_label: Optional[str]  # For unresolved label references
@@ -191,6 +218,8 @@ class Instruction:
 @dataclass
 class Label:
     """A label definition."""
+    __slots__ = ('name', 'address', 'line_num')
+    
     name: str
     address: int
     line_num: int
@@ -220,8 +249,17 @@ class ZPLCAssembler:
         self.verbose = verbose
         self.instructions: list[Instruction] = []
         self.labels: dict[str, Label] = {}
+        # .DB/.BYTE data: (number of instructions before it, bytes)
+        self.data_blocks: list[tuple[int, bytes]] = []
         self.entry_point = 0
         self.current_address = 0
+        # Directive -> handler(operand, line_num)
+        self._directives = {
+            '.ORG': self._dir_org,
+            '.ENTRY': self._dir_entry,
+            '.DB': self._dir_db,
+            '.BYTE': self._dir_db,
+        }
     
     def log(self, msg: str):
         """Print verbose output."""
@@ -247,9 +285,8 @@ class ZPLCAssembler:
         if s.startswith("'") and s.endswith("'") and len(s) >= 3:
             if s[1] == '\\':
                 # Escape sequences
-                escapes = {'n': 10, 'r': 13, 't': 9, '\\': 92, "'": 39, '0': 0}
-                if len(s) >= 4 and s[2] in escapes:
-                    return escapes[s[2]]
+                if len(s) >= 4 and s[2] in _CHAR_ESCAPES:
+                    return _CHAR_ESCAPES[s[2]]
             return ord(s[1])
         
         # Handle negative
@@ -260,15 +297,8 @@ class ZPLCAssembler:
         elif s[0] == '+':
             s = s[1:]
         
-        # Parse base
-        if s.lower().startswith('0x'):
-            value = int(s, 16)
-        elif s.lower().startswith('0b'):
-            value = int(s, 2)
-        elif s.lower().startswith('0o'):
-            value = int(s, 8)
-        else:
-            value = int(s)
+        # Parse base (one prefix lookup instead of three lower() calls)
+        value = int(s, _BASE_PREFIXES.get(s[:2].lower(), 10))
         
         return -value if negative else value
     
@@ -284,9 +314,10 @@ class ZPLCAssembler:
             return None, None
         
         # Check if it's a label reference
-        if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', operand_str):
-            # It's a label - will be resolved in pass 2
-            return None, operand_str
+        if _is_identifier(operand_str):
+            # It's a label - will be resolved in pass 2 (labels are stored
+            # uppercase and interned, so the lookup there is an identity hit)
+            return None, sys.intern(operand_str.upper())
         
         # Parse as number
         try:
@@ -302,23 +333,22 @@ class ZPLCAssembler:
         Syntax:
             [label:] [instruction [operand]] [; comment]
         """
-        # Remove comments
-        if ';' in line:
-            line = line[:line.index(';')]
-        
-        line = line.strip()
+        # Remove comments (one C-level split instead of in + index + slice)
+        line = line.partition(';')[0].strip()
         if not line:
             return
         
         # Check for label
-        label_match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s*:', line)
-        if label_match:
-            label_name = label_match.group(1).upper()
+        head, colon, rest = line.partition(':')
+        label_name = head.rstrip()
+        if colon and _is_identifier(label_name):
+            label_name = sys.intern(label_name.upper())
             if label_name in self.labels:
                 raise AssemblerError(f"Duplicate label '{label_name}'", line_num, line)
             self.labels[label_name] = Label(label_name, self.current_address, line_num)
-            self.log(f"Label '{label_name}' at 0x{self.current_address:04X}")
-            line = line[label_match.end():].strip()
+            if self.verbose:
+                self.log(f"Label '{label_name}' at 0x{self.current_address:04X}")
+            line = rest.strip()
             if not line:
                 return
         
@@ -333,10 +363,10 @@ class ZPLCAssembler:
             return
         
         # Look up opcode
-        if mnemonic not in OPCODE_BY_NAME:
+        opcode = OPCODE_BY_NAME.get(mnemonic)
+        if opcode is None:
             raise AssemblerError(f"Unknown instruction '{mnemonic}'", line_num, line)
         
-        opcode = OPCODE_BY_NAME[mnemonic]
         operand_size = OPERAND_SIZE[opcode]
         
         # Parse operand
@@ -361,57 +391,62 @@ class ZPLCAssembler:
         
         # Advance address
         instr_size = 1 + operand_size
-        self.log(f"0x{self.current_address:04X}: {mnemonic} {operand_str} ({instr_size} bytes)")
+        # Per-line messages: only format them when they will be printed
+        if self.verbose:
+            self.log(f"0x{self.current_address:04X}: {mnemonic} {operand_str} ({instr_size} bytes)")
         self.current_address += instr_size
     
     def handle_directive(self, directive: str, operand: str, line_num: int):
         """Handle assembler directives."""
-        if directive == '.ORG':
-            # Set origin address
+        handler = self._directives.get(directive)
+        if handler is None:
+            raise AssemblerError(f"Unknown directive '{directive}'", line_num, "")
+        handler(operand, line_num)
+    
+    def _dir_org(self, operand: str, line_num: int):
+        """.ORG: set origin address."""
+        try:
+            self.current_address = self.parse_number(operand)
+            self.log(f"Origin set to 0x{self.current_address:04X}")
+        except ValueError:
+            raise AssemblerError(f"Invalid address for .ORG: {operand}", line_num, "")
+    
+    def _dir_entry(self, operand: str, line_num: int):
+        """.ENTRY: set entry point."""
+        operand = operand.strip()
+        if _is_identifier(operand):
+            # It's a label - will be resolved later
+            self.entry_point = sys.intern(operand.upper())
+        else:
             try:
-                self.current_address = self.parse_number(operand)
-                self.log(f"Origin set to 0x{self.current_address:04X}")
+                self.entry_point = self.parse_number(operand)
             except ValueError:
-                raise AssemblerError(f"Invalid address for .ORG: {operand}", line_num, "")
-        
-        elif directive == '.ENTRY':
-            # Set entry point
-            operand = operand.strip()
-            if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', operand):
-                # It's a label - will be resolved later
-                self.entry_point = operand.upper()
-            else:
-                try:
-                    self.entry_point = self.parse_number(operand)
-                except ValueError:
-                    raise AssemblerError(f"Invalid entry point: {operand}", line_num, "")
-        
-        elif directive == '.DB' or directive == '.BYTE':
-            # Define byte(s)
-            for val_str in operand.split(','):
-                val = self.parse_number(val_str.strip())
-                # Store as raw byte - we'll handle this in pass 2
-                # For now, just advance address
-                self.current_address += 1
-        
-        else:
-            raise AssemblerError(f"Unknown directive '{directive}'", line_num, "")
+                raise AssemblerError(f"Invalid entry point: {operand}", line_num, "")
+    
+    def _dir_db(self, operand: str, line_num: int):
+        """.DB/.BYTE: define byte(s)."""
+        parse_number = self.parse_number
+        data = bytes(parse_number(val_str) & 0xFF for val_str in operand.split(','))
+        # Emitted in pass 2 between the instructions around it
+        self.data_blocks.append((len(self.instructions), data))
+        self.current_address += len(data)
     
     def resolve_labels(self):
         """Pass 2: Resolve label references."""
+        labels_get = self.labels.get
         for instr in self.instructions:
-            if instr.operand_label:
-                label_name = instr.operand_label.upper()
-                if label_name not in self.labels:
+            label_name = instr.operand_label
+            if label_name:
+                label = labels_get(label_name)
+                if label is None:
                     raise AssemblerError(
                         f"Undefined label '{label_name}'",
                         instr.line_num,
                         ""
                     )
-                label = self.labels[label_name]
                 
                 # For relative jumps (JR, JRZ, JRNZ), calculate offset
-                if instr.opcode in (Opcode.JR, Opcode.JRZ, Opcode.JRNZ):
+                if instr.opcode in RELATIVE_JUMPS:
                     # Offset is from PC after instruction (PC + 2)
                     offset = label.address - (instr.address + 2)
                     if offset < -128 or offset > 127:
@@ -425,7 +460,8 @@ class ZPLCAssembler:
                     # Absolute address
                     instr.operand = label.address
                 
-                self.log(f"Resolved '{label_name}' -> 0x{instr.operand:04X}")
+                if self.verbose:
+                    self.log(f"Resolved '{label_name}' -> 0x{instr.operand:04X}")
         
         # Resolve entry point if it's a label
         if isinstance(self.entry_point, str):
@@ -435,25 +471,43 @@ class ZPLCAssembler:
     
     def emit_bytecode(self) -> bytes:
         """Generate bytecode from parsed instructions."""
-        output = bytearray()
-        
-        for instr in self.instructions:
+        # Final size is known up front: one buffer, operands packed in place
+        sizes = [OPERAND_SIZE[instr.opcode] for instr in self.instructions]
+        # .DB data keyed by the index of the instruction that follows it
+        data_at: dict[int, bytes] = {}
+        for index, data in self.data_blocks:
+            data_at[index] = data_at.get(index, b"") + data
+        output = bytearray(len(sizes) + sum(sizes) + sum(map(len, data_at.values())))
+        offset = 0
+        
+        for index, (instr, operand_size) in enumerate(zip(self.instructions, sizes)):
+            data = data_at.get(index)
+            if data:
+                output[offset:offset + len(data)] = data
+                offset += len(data)
+            
             # Emit opcode
-            output.append(instr.opcode.value)
+            output[offset] = instr.opcode
             
             # Emit operand
-            operand_size = OPERAND_SIZE[instr.opcode]
             operand = instr.operand if instr.operand is not None else 0
             
             if operand_size == 1:
                 # 8-bit operand (could be signed)
-                output.append(operand & 0xFF)
+                output[offset + 1] = operand & 0xFF
             elif operand_size == 2:
                 # 16-bit little-endian
-                output.extend(struct.pack('<H', operand & 0xFFFF))
+                U16.pack_into(output, offset + 1, operand & 0xFFFF)
             elif operand_size == 4:
                 # 32-bit little-endian
-                output.extend(struct.pack('<I', operand & 0xFFFFFFFF))
+                U32.pack_into(output, offset + 1, operand & 0xFFFFFFFF)
+            
+            offset += 1 + operand_size
+        
+        # Data after the last instruction
+        data = data_at.get(len(sizes))
+        if data:
+            output[offset:offset + len(data)] = data
         
         return bytes(output)
     
@@ -482,14 +536,17 @@ class ZPLCAssembler:
         #   segment_count (2 bytes, uint16_t)
         #   reserved      (4 bytes, uint32_t)
         # Total: 4+2+2+4+4+4+4+2+2+4 = 32 bytes
-        # TODO: Calculate proper CRC32
-        header = struct.pack(
+        # crc32 is filled in below, once the whole file is known
+        header = bytearray(32)
+        struct.pack_into(
             '<IHHIIIIHHI',
+            header,
+            0,
             ZPLC_MAGIC,           # magic (4)
             ZPLC_VERSION_MAJOR,   # version_major (2)
             ZPLC_VERSION_MINOR,   # version_minor (2)
             0,                    # flags (4)
-            0,                    # crc32 (4) - TODO
+            0,                    # crc32 (4)
             code_size,            # code_size (4)
             0,                    # data_size (4)
             self.entry_point if isinstance(self.entry_point, int) else 0,  # entry_point (2)
@@ -505,7 +562,14 @@ class ZPLCAssembler:
         
         assert len(segment_entry) == 8, f"Segment entry size mismatch: {len(segment_entry)}"
         
-        return header + segment_entry + bytecode
+        # CRC32 of the file excluding the crc32 field itself (offset 12)
+        crc = zlib.crc32(header[:12])
+        crc = zlib.crc32(header[16:], crc)
+        crc = zlib.crc32(segment_entry, crc)
+        crc = zlib.crc32(bytecode, crc)
+        U32.pack_into(header, 12, crc)
+        
+        return bytes(header) + segment_entry + bytecode
     
     def assemble(self, source: str) -> bytes:
         """
@@ -515,12 +579,17 @@ class ZPLCAssembler:
         """
         self.instructions = []
         self.labels = {}
+        self.data_blocks = []
         self.current_address = 0
         self.entry_point = 0
         
         # Pass 1: Parse
         self.log("=== Pass 1: Parse ===")
         for line_num, line in enumerate(source.splitlines(), 1):
+            # Blank and comment-only lines never reach parse_line
+            head = line.lstrip()
+            if not head or head[0] == ';':
+                continue
             try:
                 self.parse_line(line, line_num)
             except AssemblerError:
@@ -539,9 +608,10 @@ class ZPLCAssembler:
         self.log(f"Generated {len(bytecode)} bytes of code")
         return bytecode
     
-    def assemble_file(self, input_path: Path, output_path: Path, raw: bool = False):
-        """Assemble a file and write output."""
-        source = input_path.read_text()
+    def assemble_file(self, input_path: Path, output_path: Path, raw: bool = False) -> bytes:
+        """Assemble a file and write output. Returns the raw bytecode."""
+        # One decode, independent of the locale; splitlines() handles \r\n
+        source = input_path.read_bytes().decode('utf-8', 'replace')
         
         bytecode = self.assemble(source)
         
@@ -552,6 +622,8 @@ class ZPLCAssembler:
             zplc_data = self.create_zplc_file(bytecode)
             output_path.write_bytes(zplc_data)
             self.log(f"Wrote {len(zplc_data)} bytes to {output_path} (32 header + 8 segment + {len(bytecode)} code)")
+        
+        return bytecode
 
 
 # =============================================================================
@@ -561,45 +633,44 @@ class ZPLCAssembler:
 def disassemble(bytecode: bytes, base_addr: int = 0) -> str:
     """Disassemble bytecode to readable text."""
     lines = []
+    append = lines.append
     pc = 0
+    size = len(bytecode)
     
-    # Build reverse lookup
-    opcode_names = {op.value: op.name for op in Opcode}
-    
-    while pc < len(bytecode):
+    while pc < size:
         addr = base_addr + pc
         opcode = bytecode[pc]
         
-        if opcode not in opcode_names:
-            lines.append(f"0x{addr:04X}: ??? (0x{opcode:02X})")
+        name = OPCODE_NAME[opcode]
+        if name is None:
+            append(f"0x{addr:04X}: ??? (0x{opcode:02X})")
             pc += 1
             continue
         
-        name = opcode_names[opcode]
-        operand_size = get_operand_size(opcode)
+        operand_size = OPERAND_SIZE[opcode]
         instr_size = 1 + operand_size
         
-        if pc + operand_size >= len(bytecode):
-            lines.append(f"0x{addr:04X}: {name} <truncated>")
+        if pc + operand_size >= size:
+            append(f"0x{addr:04X}: {name} <truncated>")
             break
         
         if operand_size == 0:
-            lines.append(f"0x{addr:04X}: {name}")
+            append(f"0x{addr:04X}: {name}")
         elif operand_size == 1:
             operand = bytecode[pc + 1]
             # Show signed for relative jumps
-            if opcode in (Opcode.JR, Opcode.JRZ, Opcode.JRNZ):
+            if opcode in RELATIVE_JUMPS:
                 signed_op = operand if operand < 128 else operand - 256
                 target = addr + 2 + signed_op
-                lines.append(f"0x{addr:04X}: {name} {signed_op} (-> 0x{target:04X})")
+                append(f"0x{addr:04X}: {name} {signed_op} (-> 0x{target:04X})")
             else:
-                lines.append(f"0x{addr:04X}: {name} {operand} (0x{operand:02X})")
+                append(f"0x{addr:04X}: {name} {operand} (0x{operand:02X})")
         elif operand_size == 2:
-            operand = struct.unpack_from('<H', bytecode, pc + 1)[0]
-            lines.append(f"0x{addr:04X}: {name} 0x{operand:04X}")
+            operand = U16.unpack_from(bytecode, pc + 1)[0]
+            append(f"0x{addr:04X}: {name} 0x{operand:04X}")
         else:  # 4 bytes
-            operand = struct.unpack_from('<I', bytecode, pc + 1)[0]
-            lines.append(f"0x{addr:04X}: {name} 0x{operand:08X}")
+            operand = U32.unpack_from(bytecode, pc + 1)[0]
+            append(f"0x{addr:04X}: {name} 0x{operand:08X}")
         
         pc += instr_size
     
@@ -610,6 +681,35 @@ def disassemble(bytecode: bytes, base_addr: int = 0) -> str:
 # CLI
 # =============================================================================
 
+def _assemble_one(input_path: Path, raw: bool) -> tuple[Path, Path, Optional[str]]:
+    """Batch worker: assemble one file next to its source. Returns (in, out, error)."""
+    output_path = input_path.with_suffix('.bin' if raw else '.zplc')
+    try:
+        ZPLCAssembler().assemble_file(input_path, output_path, raw=raw)
+    except AssemblerError as e:
+        return input_path, output_path, f"Assembly error: {e}"
+    except Exception as e:
+        return input_path, output_path, f"Error: {e}"
+    return input_path, output_path, None
+
+
+def assemble_batch(inputs: list[Path], raw: bool = False) -> bool:
+    """
+    Assemble several files in parallel, one process per core.
+    
+    Results are reported in input order. Returns True if every file assembled.
+    """
+    ok = True
+    with ProcessPoolExecutor(max_workers=min(len(inputs), os.cpu_count() or 1)) as ex:
+        for input_path, output_path, error in ex.map(_assemble_one, inputs, [raw] * len(inputs)):
+            if error:
+                print(f"{input_path}: {error}", file=sys.stderr)
+                ok = False
+            else:
+                print(f"Assembled: {input_path} -> {output_path}")
+    return ok
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='ZPLC Assembler - Convert text assembly to bytecode',
@@ -619,6 +719,7 @@ Examples:
     %(prog)s input.asm -o output.zplc
     %(prog)s input.asm --raw -o output.bin
     %(prog)s input.asm --disasm
+    %(prog)s examples/*.asm          # several files, assembled in parallel
 
 Assembly Syntax:
     ; This is a comment
@@ -635,8 +736,8 @@ Assembly Syntax:
 """
     )
     
-    parser.add_argument('input', type=Path, help='Input assembly file')
-    parser.add_argument('-o', '--output', type=Path, help='Output file (default: input with .zplc extension)')
+    parser.add_argument('input', type=Path, nargs='+', help='Input assembly file(s)')
+    parser.add_argument('-o', '--output', type=Path, help='Output file (default: input with .zplc extension; single input only)')
     parser.add_argument('--raw', action='store_true', help='Output raw bytecode without .zplc header')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--disasm', action='store_true', help='Disassemble output and print')
@@ -644,9 +745,17 @@ Assembly Syntax:
     
     args = parser.parse_args()
     
-    if not args.input.exists():
-        print(f"Error: Input file not found: {args.input}", file=sys.stderr)
-        sys.exit(1)
+    for input_path in args.input:
+        if not input_path.exists():
+            print(f"Error: Input file not found: {input_path}", file=sys.stderr)
+            sys.exit(1)
+    
+    # Several inputs: each one goes next to its source, in parallel
+    if len(args.input) > 1:
+        if args.output or args.disasm or args.hex:
+            parser.error("-o/--output, --disasm and --hex need a single input file")
+        sys.exit(0 if assemble_batch(args.input, raw=args.raw) else 1)
+    args.input = args.input[0]
     
     # Default output path
     if args.output is None:
@@ -657,22 +766,20 @@ Assembly Syntax:
     asm = ZPLCAssembler(verbose=args.verbose)
     
     try:
-        asm.assemble_file(args.input, args.output, raw=args.raw)
+        bytecode = asm.assemble_file(args.input, args.output, raw=args.raw)
         print(f"Assembled: {args.input} -> {args.output}")
         
         # Optional: show disassembly
         if args.disasm:
-            bytecode = asm.emit_bytecode()
             print("\nDisassembly:")
             print(disassemble(bytecode))
         
         # Optional: hex dump
         if args.hex:
-            bytecode = asm.emit_bytecode()
             print("\nHex dump:")
             for i in range(0, len(bytecode), 16):
                 chunk = bytecode[i:i+16]
-                hex_str = ' '.join(f'{b:02X}' for b in chunk)
+                hex_str = chunk.hex(' ', 1).upper()
                 print(f"0x{i:04X}: {hex_str}")
         
     except AssemblerError as e:
@@ -1,11 +1,23 @@
 import serial
-import time
 import sys
 import os
 
 PORT = '/dev/cu.usbmodem11401'
 BAUD = 115200
 
+def command(ser, cmd, wait_for=b'zplc:~$', timeout=5.0):
+    """
+    Send a shell command and block until wait_for arrives (or timeout).
+    Returns the text read; it ends with wait_for only if it arrived.
+    """
+    ser.write(f'{cmd}\r\n'.encode())
+    prev_timeout = ser.timeout
+    ser.timeout = timeout
+    try:
+        return ser.read_until(wait_for).decode(errors='ignore')
+    finally:
+        ser.timeout = prev_timeout
+
 def upload(hex_file, port):
     if not os.path.exists(hex_file):
         print(f"Error: {hex_file} not found")
@@ -17,38 +29,43 @@ def upload(hex_file, port):
     total_size = len(hex_data) // 2
     print(f"Uploading {hex_file} ({total_size} bytes) to {port}...")
 
-    ser = serial.Serial(port, BAUD, timeout=1)
-    time.sleep(1) # Wait for serial to stabilize
+    ser = serial.Serial(port, BAUD, timeout=1, write_timeout=5)
+    # Wait for the shell prompt instead of a fixed delay
+    ser.write(b'\r\n')
+    ser.read_until(b'zplc:~$')
+    ser.reset_input_buffer()
     
     # 0. Stop current execution if any
     print("Stopping ZPLC...")
-    ser.write(b'zplc stop\r\n')
-    time.sleep(0.5)
+    command(ser, 'zplc stop')
     
     # 1. Load command
-    cmd = f'zplc load {total_size}\r\n'
-    print(f"Sending: {cmd.strip()}")
-    ser.write(cmd.encode())
-    time.sleep(0.5)
+    cmd = f'zplc load {total_size}'
+    print(f"Sending: {cmd}")
+    if not command(ser, cmd, b'OK:').endswith('OK:'):
+        print("Error: zplc load not acknowledged")
+        ser.close()
+        return
     
-    # 2. Send data in chunks
-    chunk_size = 64
+    # 2. Send data in chunks, each one acknowledged before the next
+    # (512 hex chars = 256 bytes per command, within the shell buffers)
+    chunk_size = 512
     for i in range(0, len(hex_data), chunk_size):
         chunk = hex_data[i:i+chunk_size]
-        cmd = f'zplc data {chunk}\r\n'
         print(f"Uploading chunk {i//chunk_size + 1}: {chunk[:10]}...")
-        ser.write(cmd.encode())
-        time.sleep(0.1)
+        if not command(ser, f'zplc data {chunk}', b'OK:').endswith('OK:'):
+            print(f"Error: chunk {i//chunk_size + 1} not acknowledged")
+            ser.close()
+            return
         
     # 3. Start command
     print("Starting ZPLC...")
-    ser.write(b'zplc start\r\n')
-    time.sleep(0.5)
-    
-    # Read response
-    while ser.in_waiting:
-        line = ser.readline().decode().strip()
-        print(f"PICO: {line}")
+    resp = command(ser, 'zplc start', b'OK:')
+    if resp.endswith('OK:'):
+        # Rest of the "OK: ..." line
+        print(f"PICO: OK:{ser.readline().decode(errors='ignore').rstrip()}")
+    else:
+        print(f"Error: zplc start not acknowledged: {resp.strip()}")
         
     ser.close()
     print("Upload complete!")